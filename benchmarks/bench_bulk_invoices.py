@@ -0,0 +1,68 @@
+"""Invoice creation throughput, one request per invoice versus bulk inserts.
+
+Run with ``python -m benchmarks.bench_bulk_invoices``. Both paths go through
+``InvoiceRepository`` against a SQLite file, so the numbers compare the cost
+per row of a commit and reload per invoice with one multi-row
+``INSERT ... RETURNING`` per batch.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.common import create_engine, print_table, seed, session_factory
+from infrastructure.repositories.postgres import InvoiceRepository
+
+STUDENTS = 100
+
+
+def invoice_rows(count: int, prefix: str) -> list[dict]:
+    return [
+        {
+            "ref": f"{prefix}{i:08d}",
+            "student_id": i % STUDENTS + 1,
+            "school_id": 1,
+            "value": Decimal("100.00"),
+            "date": datetime.now(),
+            "status": "PENDING",
+        }
+        for i in range(count)
+    ]
+
+
+async def main(rows: int, batch_size: int) -> None:
+    engine = await create_engine("bulk_invoices")
+    await seed(engine, schools=1, students_per_school=STUDENTS, invoices_per_student=0)
+    repo = InvoiceRepository(session_factory=session_factory(engine))
+
+    single = invoice_rows(rows, "ONE")
+    start = time.perf_counter()
+    for row in single:
+        await repo.create_invoice(**row)
+    single_seconds = time.perf_counter() - start
+
+    bulk = invoice_rows(rows, "BULK")
+    start = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        _, errors = await repo.create_invoices_bulk(bulk[offset : offset + batch_size])
+        assert not errors, errors
+    bulk_seconds = time.perf_counter() - start
+    await engine.dispose()
+
+    print_table(
+        ["mode", "rows", "seconds", "rows_per_sec"],
+        [
+            ["create_invoice", rows, single_seconds, rows / single_seconds],
+            [f"bulk ({batch_size}/batch)", rows, bulk_seconds, rows / bulk_seconds],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size))
@@ -0,0 +1,125 @@
+"""Per-row cost of turning ORM rows into domain models.
+
+Run with ``python -m benchmarks.bench_mappers``. Compares the validating
+constructors the repositories used before (``Student(...)`` etc.) with the
+trusted ``model_construct`` mappers in ``infrastructure.repositories.mappers``.
+"""
+
+import argparse
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.common import print_table
+from domain.models.invoice import Invoice, InvoiceStatus
+from domain.models.school import School
+from domain.models.student import Student
+from infrastructure.database.orm import InvoiceTable, SchoolTable, StudentTable
+from infrastructure.repositories.mappers import to_invoice, to_student
+
+ROWS = 100_000
+
+
+def validated_student(student: StudentTable) -> Student:
+    return Student(
+        id=student.id,
+        first_name=student.first_name,
+        last_name=student.last_name,
+        email=student.email,
+        age=student.age,
+        created_at=student.created_at,
+    )
+
+
+def validated_invoice(invoice: InvoiceTable) -> Invoice:
+    return Invoice(
+        id=invoice.id,
+        ref=invoice.ref,
+        value=invoice.value,
+        date=invoice.date,
+        status=invoice.status,
+        created_at=invoice.created_at,
+        student=validated_student(invoice.student),
+        school=School(
+            id=invoice.school.id,
+            ref=invoice.school.ref,
+            name=invoice.school.name,
+            created_at=invoice.school.created_at,
+        ),
+    )
+
+
+def build_rows(count: int) -> tuple[list[StudentTable], list[InvoiceTable]]:
+    now = datetime.now()
+    school = SchoolTable(id=1, ref="SCH1", name="School", created_at=now)
+    students = [
+        StudentTable(
+            id=i,
+            first_name="Student",
+            last_name=str(i),
+            email=f"student{i}@bench.com",
+            age=10 + i % 8,
+            created_at=now,
+        )
+        for i in range(count)
+    ]
+    invoices = [
+        InvoiceTable(
+            id=i,
+            ref=f"INV{i}",
+            value=Decimal("100.00"),
+            date=now,
+            status=InvoiceStatus.PENDING,
+            created_at=now,
+            student_id=student.id,
+            school_id=school.id,
+            student=student,
+            school=school,
+        )
+        for i, student in enumerate(students)
+    ]
+    return students, invoices
+
+
+def per_row_us(func, rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return (time.perf_counter() - start) / len(rows) * 1_000_000
+
+
+def main(count: int) -> None:
+    students, invoices = build_rows(count)
+    expand = ("student", "school")
+    cases = [
+        ("student", validated_student, to_student, students),
+        (
+            "invoice (expanded)",
+            validated_invoice,
+            lambda i: to_invoice(i, expand),
+            invoices,
+        ),
+        ("invoice (slim)", None, to_invoice, invoices),
+    ]
+
+    rows = []
+    for name, before, after, data in cases:
+        before_us = per_row_us(before, data) if before else None
+        after_us = per_row_us(after, data)
+        rows.append(
+            [
+                name,
+                before_us if before_us is not None else "-",
+                after_us,
+                f"{before_us / after_us:.1f}x" if before_us else "-",
+            ]
+        )
+    print(f"{count} rows")
+    print_table(["mapping", "validated_us", "trusted_us", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,59 @@
+"""First page latency of the list repositories as the tables grow.
+
+Run with ``python -m benchmarks.bench_pagination``. The time to serve page 1
+should stay flat because the total is computed with ``SELECT count(*)`` and
+only ``limit`` rows are turned into domain models.
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import create_engine, measure, print_table, seed, session_factory
+from infrastructure.repositories.postgres import (
+    InvoiceRepository,
+    SchoolRepository,
+    StudentRepository,
+)
+
+SIZES = [1_000, 10_000, 100_000]
+STUDENTS_PER_SCHOOL = 10
+
+
+async def bench_size(invoices: int, page_size: int) -> list[object]:
+    engine = await create_engine(f"pagination_{invoices}")
+    schools = max(1, invoices // (STUDENTS_PER_SCHOOL * 10))
+    await seed(
+        engine,
+        schools=schools,
+        students_per_school=STUDENTS_PER_SCHOOL,
+        invoices_per_student=10,
+    )
+    factory = session_factory(engine)
+    invoice_repo = InvoiceRepository(session_factory=factory)
+    student_repo = StudentRepository(session_factory=factory)
+    school_repo = SchoolRepository(session_factory=factory)
+
+    invoice_stats = await measure(lambda: invoice_repo.get_invoices(limit=page_size))
+    student_stats = await measure(lambda: student_repo.get_students(limit=page_size))
+    school_stats = await measure(lambda: school_repo.get_schools(limit=page_size))
+    await engine.dispose()
+
+    return [
+        invoices,
+        invoice_stats["median_ms"],
+        student_stats["median_ms"],
+        school_stats["median_ms"],
+    ]
+
+
+async def main(sizes: list[int], page_size: int) -> None:
+    rows = [await bench_size(size, page_size) for size in sizes]
+    print_table(["invoices", "invoices_ms", "students_ms", "schools_ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.page_size))
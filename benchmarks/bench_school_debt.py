@@ -0,0 +1,48 @@
+"""Latency of SchoolService.get_school_debt as schools accumulate invoices.
+
+Run with ``python -m benchmarks.bench_school_debt``. Every school gets the
+requested number of invoices. The debt is read from the ``school_balances``
+ledger, so latency should stay flat as invoices per school grow.
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import create_engine, measure, print_table, seed, session_factory
+from domain.services.school_services import SchoolService
+from infrastructure.repositories.postgres import PostgresRepository
+
+INVOICES_PER_SCHOOL = [1_000, 5_000, 20_000]
+STUDENTS_PER_SCHOOL = 100
+SCHOOLS = 5
+
+
+async def bench_size(invoices_per_school: int) -> list[object]:
+    engine = await create_engine(f"school_debt_{invoices_per_school}")
+    await seed(
+        engine,
+        schools=SCHOOLS,
+        students_per_school=STUDENTS_PER_SCHOOL,
+        invoices_per_student=max(1, invoices_per_school // STUDENTS_PER_SCHOOL),
+    )
+    service = SchoolService(
+        repository=PostgresRepository(session_factory=session_factory(engine))
+    )
+
+    stats = await measure(lambda: service.get_school_debt(school_id=1))
+    school = await service.get_school_debt(school_id=1)
+    await engine.dispose()
+
+    return [invoices_per_school, stats["median_ms"], stats["max_ms"], school.total_debt]
+
+
+async def main(sizes: list[int]) -> None:
+    rows = [await bench_size(size) for size in sizes]
+    print_table(["invoices_per_school", "median_ms", "max_ms", "total_debt"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=INVOICES_PER_SCHOOL)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
@@ -0,0 +1,160 @@
+"""Cost of turning a page of invoices into a JSON response.
+
+Run with ``python -m benchmarks.bench_serialization``. The same ``Page[Invoice]``
+goes through a FastAPI app three ways: returned as a model, the default path
+that validates it against ``response_model`` again before dumping it with
+pydantic-core, and returned as a ``FastJSONResponse`` with the pydantic-core
+and with the orjson encoder. Every response body is checked against the
+default one first. Requests are sent straight to the ASGI app, so the times are the
+routing and serialization cost without the network or the database.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi_pagination import Page, Params
+
+from benchmarks.common import print_table
+from domain.models.invoice import Invoice, InvoiceStatus
+from infrastructure.database.orm import InvoiceTable, SchoolTable, StudentTable
+from infrastructure.repositories.mappers import to_invoice
+from responses import FastJSONResponse, dumps_orjson, dumps_pydantic
+
+# fastapi-pagination caps pages at 100 items
+PAGE_SIZES = (10, 50, 100)
+REQUESTS = 300
+
+
+class PydanticResponse(FastJSONResponse):
+    encoder = staticmethod(dumps_pydantic)
+
+
+class OrjsonResponse(FastJSONResponse):
+    encoder = staticmethod(dumps_orjson)
+
+
+def build_page(size: int, expand: frozenset[str]) -> Page[Invoice]:
+    now = datetime.now()
+    school = SchoolTable(id=1, ref="SCH1", name="School", created_at=now)
+    invoices = []
+    for i in range(size):
+        student = StudentTable(
+            id=i,
+            first_name="Student",
+            last_name=str(i),
+            email=f"student{i}@bench.com",
+            age=10 + i % 8,
+            created_at=now,
+        )
+        row = InvoiceTable(
+            id=i,
+            ref=f"INV{i}",
+            value=Decimal("450.00"),
+            date=now,
+            status=InvoiceStatus.PENDING,
+            created_at=now,
+            student_id=student.id,
+            school_id=school.id,
+            student=student,
+            school=school,
+        )
+        invoices.append(to_invoice(row, expand))
+    return Page.create(
+        items=invoices, params=Params(page=1, size=size), total=size * 10
+    )
+
+
+def build_app(page: Page[Invoice]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=Page[Invoice])
+    async def default() -> Page[Invoice]:
+        return page
+
+    @app.get("/pydantic", response_model=Page[Invoice])
+    async def pydantic_core() -> PydanticResponse:
+        return PydanticResponse(page)
+
+    @app.get("/orjson", response_model=Page[Invoice])
+    async def orjson_() -> OrjsonResponse:
+        return OrjsonResponse(page)
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def per_request_us(app: FastAPI, path: str, requests: int) -> float:
+    for _ in range(10):
+        await call(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(sizes: list[int], requests: int) -> None:
+    paths = ["/default", "/pydantic", "/orjson"]
+    rows = []
+    for expand in (frozenset(), frozenset({"student", "school"})):
+        for size in sizes:
+            app = build_app(build_page(size, expand))
+            bodies = {path: await call(app, path) for path in paths}
+            reference = json.loads(bodies["/default"])
+            for path, body in bodies.items():
+                if json.loads(body) != reference:
+                    raise AssertionError(f"{path} differs from the default response")
+
+            times = {path: await per_request_us(app, path, requests) for path in paths}
+            rows.append(
+                [
+                    f"{size} {'expanded' if expand else 'slim'}",
+                    len(bodies["/default"]),
+                    times["/default"],
+                    times["/pydantic"],
+                    times["/orjson"],
+                    f"{times['/default'] / times['/orjson']:.2f}x",
+                ]
+            )
+    print_table(
+        ["page", "bytes", "default_us", "pydantic_us", "orjson_us", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(PAGE_SIZES))
+    parser.add_argument("--requests", type=int, default=REQUESTS)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.requests))
@@ -0,0 +1,98 @@
+"""Time from process start to the first served request.
+
+Run with ``python -m benchmarks.bench_startup``. Each run starts a fresh
+``uvicorn main:app`` process against an already migrated SQLite database and
+polls until ``GET /`` answers, then until a database backed route does, so
+the numbers include interpreter start, imports, the lifespan connectivity
+check and pool warm up.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import print_table
+from infrastructure.database.migrations import migrate
+
+POLL_INTERVAL = 0.005
+TIMEOUT = 30.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(client: httpx.Client, url: str, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"{url} did not answer within {TIMEOUT}s")
+
+
+def start_once(database_url: str) -> tuple[float, float]:
+    """Return seconds until ``GET /`` and until ``GET /schools/`` answer."""
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": database_url}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + TIMEOUT
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            _wait_for(client, "/", deadline)
+            first_request = time.perf_counter() - started
+            _wait_for(client, "/schools/", deadline)
+            first_query = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+    return first_request, first_query
+
+
+async def _migrated_database() -> str:
+    path = Path(tempfile.mkdtemp()) / "startup.sqlite3"
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = create_async_engine(url)
+    await migrate(engine)
+    await engine.dispose()
+    return url
+
+
+def main(runs: int) -> None:
+    database_url = asyncio.run(_migrated_database())
+    timings = [start_once(database_url) for _ in range(runs)]
+    rows = []
+    for label, values in (
+        ("first request", [first for first, _ in timings]),
+        ("first query", [query for _, query in timings]),
+    ):
+        values_ms = sorted(value * 1000 for value in values)
+        rows.append([label, values_ms[0], statistics.median(values_ms), values_ms[-1]])
+    print_table(["until", "min_ms", "median_ms", "max_ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,495 @@
+"""Latency, SQL statements and memory of every endpoint, service and repository.
+
+Run with ``python -m benchmarks.bench_suite``. For each dataset size (number
+of invoices, built with ``infrastructure.database.generate``) every router
+endpoint is called through ``httpx.ASGITransport`` and every service and
+repository read method directly, and the table reports:
+
+- p50/p95/p99 latency over ``--repeat`` calls
+- SQL statements per call, from the ``db_queries_total`` counter
+- peak memory allocated by one extra call traced with ``tracemalloc``
+
+Calls rotate over the ids of the dataset and the read cache is cleared
+before each one, so every call measures the database path. Write cases
+create new rows, the delete cases remove generated ones and run last.
+
+``--output results.json`` writes the numbers with the commit they were taken
+on; ``--compare baseline.json`` prints the change against a previous run and
+exits with 1 when a case got slower than ``--threshold`` percent or runs
+more statements.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from benchmarks.common import create_engine, percentile, print_table, session_factory
+from dependencies import get_session_factory
+from domain.services.school_services import SchoolService
+from domain.services.student_services import StudentService
+from infrastructure.database.generate import GenerateSpec, generate
+from infrastructure.database.instrumentation import instrument_engine
+from infrastructure.metrics import DB_QUERIES
+from infrastructure.repositories.cache import cache
+from infrastructure.repositories.postgres import (
+    InvoiceRepository,
+    PostgresRepository,
+    SchoolRepository,
+    StudentRepository,
+)
+from main import app
+
+SIZES = [10_000, 100_000]
+STUDENTS_PER_SCHOOL = 50
+INVOICES_PER_STUDENT = 10
+BULK_ROWS = 100
+
+
+@dataclass
+class Dataset:
+    size: int
+    engine: AsyncEngine
+    factory: async_sessionmaker[AsyncSession]
+    rows: dict[str, int]
+
+    def pick(self, table: str, call: int) -> int:
+        """An id of ``table`` that differs between consecutive calls."""
+        return 1 + (call * 7919) % self.rows[table]
+
+
+@dataclass
+class Case:
+    kind: str
+    name: str
+    call: Callable[[int], Awaitable[Any]]
+
+
+async def build_dataset(size: int) -> Dataset:
+    engine = await create_engine(f"suite_{size}")
+    instrument_engine(engine)
+    per_school = STUDENTS_PER_SCHOOL * INVOICES_PER_STUDENT
+    spec = GenerateSpec(
+        schools=max(1, size // per_school),
+        students_per_school=STUDENTS_PER_SCHOOL,
+        invoices_per_student=INVOICES_PER_STUDENT,
+    )
+    report = await generate(engine, spec)
+    return Dataset(size, engine, session_factory(engine), report.rows)
+
+
+def endpoint_cases(client: AsyncClient, data: Dataset) -> list[Case]:
+    def endpoint(method: str, name: str, url, body=None) -> Case:
+        async def call(i: int) -> None:
+            response = await client.request(
+                method,
+                url(i) if callable(url) else url,
+                json=body(i) if body else None,
+            )
+            response.raise_for_status()
+
+        return Case("endpoint", f"{method} {name}", call)
+
+    def reads(name: str, url: Callable[[int], str]) -> Case:
+        return endpoint("GET", name, url)
+
+    def writes(name: str, url: str, body: Callable[[int], Any]) -> Case:
+        return endpoint("POST", name, url, body)
+
+    def deletes(name: str, url: Callable[[int], str]) -> Case:
+        return endpoint("DELETE", name, url)
+
+    tag = f"{data.size}-{time.monotonic_ns()}"
+
+    def invoice(i: int, n: int = 0) -> dict[str, Any]:
+        return {
+            "ref": f"BENCH-INV-{tag}-{i}-{n}",
+            "student_id": data.pick("students", i),
+            "school_id": data.pick("schools", i),
+            "value": "450.00",
+            "date": "2025-01-01T00:00:00",
+            "status": "PENDING",
+        }
+
+    return [
+        reads("/", lambda i: "/"),
+        reads("/schools/", lambda i: "/schools/?size=50"),
+        reads("/schools/cursor", lambda i: "/schools/cursor?size=50"),
+        reads("/schools/debt", lambda i: "/schools/debt?size=50"),
+        reads("/schools/{id}", lambda i: f"/schools/{data.pick('schools', i)}"),
+        reads(
+            "/schools/{id}/students",
+            lambda i: f"/schools/{data.pick('schools', i)}/students?size=50",
+        ),
+        reads(
+            "/schools/{id}/debt", lambda i: f"/schools/{data.pick('schools', i)}/debt"
+        ),
+        reads("/students/", lambda i: "/students/?size=50"),
+        reads("/students/cursor", lambda i: "/students/cursor?size=50"),
+        reads("/students/{id}", lambda i: f"/students/{data.pick('students', i)}"),
+        reads(
+            "/students/{id}/financial-status",
+            lambda i: f"/students/{data.pick('students', i)}/financial-status",
+        ),
+        reads("/invoices/", lambda i: "/invoices/?size=50"),
+        reads(
+            "/invoices/?expand=student,school",
+            lambda i: "/invoices/?size=50&expand=student,school",
+        ),
+        reads("/invoices/cursor", lambda i: "/invoices/cursor?size=50"),
+        reads("/invoices/payments", lambda i: "/invoices/payments?size=50"),
+        reads(
+            "/invoices/payments/stream?student_id",
+            lambda i: (
+                f"/invoices/payments/stream?student_id={data.pick('students', i)}"
+            ),
+        ),
+        writes(
+            "/students/financial-status:batch",
+            "/students/financial-status:batch?size=50",
+            lambda i: {"ids": [data.pick("students", i + n) for n in range(50)]},
+        ),
+        writes(
+            "/schools/",
+            "/schools/",
+            lambda i: {"ref": f"BENCH-SCH-{tag}-{i}", "name": "Bench School"},
+        ),
+        writes(
+            "/students/",
+            "/students/",
+            lambda i: {
+                "first_name": "Bench",
+                "last_name": str(i),
+                "email": f"bench-{tag}-{i}@example.com",
+                "age": 12,
+            },
+        ),
+        writes("/invoices/", "/invoices/", invoice),
+        writes(
+            f"/invoices/bulk ({BULK_ROWS} rows)",
+            "/invoices/bulk",
+            lambda i: [invoice(i, n) for n in range(BULK_ROWS)],
+        ),
+        writes(
+            "/invoices/payments",
+            "/invoices/payments",
+            lambda i: {
+                "ref": f"BENCH-PAY-{tag}-{i}",
+                "invoice_id": data.pick("invoices", i),
+                "value": "10.00",
+                "date": "2025-01-15T00:00:00",
+            },
+        ),
+        # generated ids from the top down, each one deleted once
+        deletes(
+            "/invoices/payments/{id}",
+            lambda i: f"/invoices/payments/{data.rows['payments'] - i}",
+        ),
+        deletes(
+            "/invoices/{id}",
+            lambda i: f"/invoices/{data.rows['invoices'] - i}",
+        ),
+    ]
+
+
+def service_cases(data: Dataset) -> list[Case]:
+    repository = PostgresRepository(session_factory=data.factory)
+    schools = SchoolService(repository=repository)
+    students = StudentService(repository=repository)
+    return [
+        Case(
+            "service",
+            "SchoolService.get_school_students",
+            lambda i: schools.get_school_students(
+                filters={"id": data.pick("schools", i)}, limit=50
+            ),
+        ),
+        Case(
+            "service",
+            "SchoolService.get_school_debt",
+            lambda i: schools.get_school_debt(school_id=data.pick("schools", i)),
+        ),
+        Case(
+            "service",
+            "SchoolService.get_schools_debt",
+            lambda i: schools.get_schools_debt(limit=50),
+        ),
+        Case(
+            "service",
+            "StudentService.financial_status",
+            lambda i: students.financial_status(data.pick("students", i)),
+        ),
+        Case(
+            "service",
+            "StudentService.financial_statuses",
+            lambda i: students.financial_statuses(
+                [data.pick("students", i + n) for n in range(50)], limit=50
+            ),
+        ),
+    ]
+
+
+async def _drain(payments) -> None:
+    async for _ in payments:
+        pass
+
+
+def repository_cases(data: Dataset) -> list[Case]:
+    students = StudentRepository(session_factory=data.factory)
+    schools = SchoolRepository(session_factory=data.factory)
+    invoices = InvoiceRepository(session_factory=data.factory)
+
+    def case(name: str, call: Callable[[int], Awaitable[Any]]) -> Case:
+        return Case("repository", name, call)
+
+    return [
+        case(
+            "StudentRepository.get_students", lambda i: students.get_students(limit=50)
+        ),
+        case(
+            "StudentRepository.get_students_keyset",
+            lambda i: students.get_students_keyset(limit=50),
+        ),
+        case(
+            "StudentRepository.get_student",
+            lambda i: students.get_student(data.pick("students", i)),
+        ),
+        case(
+            "StudentRepository.get_financial_status",
+            lambda i: students.get_financial_status(data.pick("students", i)),
+        ),
+        case(
+            "StudentRepository.get_financial_statuses",
+            lambda i: students.get_financial_statuses(
+                [data.pick("students", i + n) for n in range(50)], limit=50
+            ),
+        ),
+        case("SchoolRepository.get_schools", lambda i: schools.get_schools(limit=50)),
+        case(
+            "SchoolRepository.get_schools_keyset",
+            lambda i: schools.get_schools_keyset(limit=50),
+        ),
+        case(
+            "SchoolRepository.get_school",
+            lambda i: schools.get_school(data.pick("schools", i)),
+        ),
+        case(
+            "SchoolRepository.get_school_debt",
+            lambda i: schools.get_school_debt(data.pick("schools", i)),
+        ),
+        case(
+            "SchoolRepository.get_schools_debt",
+            lambda i: schools.get_schools_debt(limit=50),
+        ),
+        case(
+            "InvoiceRepository.get_invoices", lambda i: invoices.get_invoices(limit=50)
+        ),
+        case(
+            "InvoiceRepository.get_invoices_keyset",
+            lambda i: invoices.get_invoices_keyset(limit=50),
+        ),
+        case(
+            "InvoiceRepository.get_payments", lambda i: invoices.get_payments(limit=50)
+        ),
+        case(
+            "InvoiceRepository.stream_payments",
+            lambda i: _drain(
+                invoices.stream_payments(student_id=data.pick("students", i))
+            ),
+        ),
+    ]
+
+
+async def run_case(case: Case, repeat: int, warmup: int) -> dict[str, Any]:
+    calls = iter(range(warmup + repeat + 1))
+    for _ in range(warmup):
+        await case.call(next(calls))
+
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        cache.clear()
+        queries_before = DB_QUERIES.get()
+        started = time.perf_counter()
+        await case.call(next(calls))
+        timings.append((time.perf_counter() - started) * 1000)
+        queries += DB_QUERIES.get() - queries_before
+
+    # tracing slows every allocation down, so memory gets a call of its own
+    cache.clear()
+    tracemalloc.start()
+    try:
+        await case.call(next(calls))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "kind": case.kind,
+        "name": case.name,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "queries_per_call": queries / repeat,
+        "peak_kib": peak / 1024,
+    }
+
+
+async def bench_size(
+    size: int, repeat: int, warmup: int, only: Optional[str]
+) -> list[dict[str, Any]]:
+    data = await build_dataset(size)
+    app.dependency_overrides[get_session_factory] = lambda: data.factory
+    results = []
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            cases = [
+                *service_cases(data),
+                *repository_cases(data),
+                *endpoint_cases(client, data),
+            ]
+            for case in cases:
+                if only and only not in case.name:
+                    continue
+                results.append({"size": size, **await run_case(case, repeat, warmup)})
+    finally:
+        app.dependency_overrides.clear()
+        await data.engine.dispose()
+    return results
+
+
+def _commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except OSError:
+        # git is not installed
+        return None
+    except subprocess.CalledProcessError:
+        # not a git checkout
+        return None
+    return result.stdout.strip() or None
+
+
+def _write_json(path: str, document: dict[str, Any]) -> None:
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def _read_json(path: str) -> dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _key(result: dict[str, Any]) -> tuple[int, str]:
+    return result["size"], result["name"]
+
+
+def compare(
+    baseline: list[dict[str, Any]], results: list[dict[str, Any]], threshold: float
+) -> int:
+    """Print the change against ``baseline`` and return the number of regressions."""
+    previous = {_key(result): result for result in baseline}
+    rows = []
+    regressions = 0
+    for result in results:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        changes = [
+            (result[metric] - before[metric]) / before[metric] * 100
+            if before[metric]
+            else 0.0
+            for metric in ("p50_ms", "p95_ms")
+        ]
+        more_queries = result["queries_per_call"] > before["queries_per_call"]
+        regressed = more_queries or max(changes) > threshold
+        regressions += regressed
+        rows.append(
+            [
+                result["size"],
+                result["name"],
+                before["p50_ms"],
+                result["p50_ms"],
+                f"{changes[0]:+.1f}%",
+                f"{changes[1]:+.1f}%",
+                f"{before['queries_per_call']:g} -> {result['queries_per_call']:g}",
+                "REGRESSION" if regressed else "",
+            ]
+        )
+    print_table(
+        ["size", "case", "base_p50", "p50", "p50_diff", "p95_diff", "queries", ""],
+        rows,
+    )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    results = []
+    for size in args.sizes:
+        results += await bench_size(size, args.repeat, args.warmup, args.only)
+
+    print_table(
+        ["size", "case", "p50_ms", "p95_ms", "p99_ms", "queries", "peak_kib"],
+        [
+            [
+                result["size"],
+                result["name"],
+                result["p50_ms"],
+                result["p95_ms"],
+                result["p99_ms"],
+                result["queries_per_call"],
+                result["peak_kib"],
+            ]
+            for result in results
+        ],
+    )
+
+    # file and git access run in a thread to keep the event loop free
+    if args.output:
+        document = {
+            "commit": await asyncio.to_thread(_commit),
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        await asyncio.to_thread(_write_json, args.output, document)
+
+    if args.compare:
+        baseline = await asyncio.to_thread(_read_json, args.compare)
+        print(f"\nCompared with {baseline.get('commit') or args.compare}:")
+        if compare(baseline["results"], results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    parser.add_argument(
+        "--threshold", type=float, default=20.0, help="allowed slowdown in percent"
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,152 @@
+import math
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from domain.models.invoice import InvoiceStatus
+from domain.models.student import StudentStatus
+from infrastructure.database.balances import rebuild_balances
+from infrastructure.database.db_engine import Base
+from infrastructure.database.orm import (
+    InvoiceTable,
+    SchoolStudentsTable,
+    SchoolTable,
+    StudentTable,
+)
+
+BATCH_SIZE = 5_000
+
+
+async def create_engine(name: str = "bench") -> AsyncEngine:
+    """Create a throwaway SQLite database file with the full schema."""
+    path = Path(tempfile.mkdtemp()) / f"{name}.sqlite3"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _insert_batches(session: AsyncSession, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await session.execute(insert(table), rows[start : start + BATCH_SIZE])
+
+
+async def seed(
+    engine: AsyncEngine,
+    *,
+    schools: int,
+    students_per_school: int,
+    invoices_per_student: int,
+) -> None:
+    """Populate the database with explicit ids so rows can reference each other."""
+    now = datetime.now()
+    school_rows = [
+        {"id": i, "ref": f"SCH{i:06d}", "name": f"School {i}", "created_at": now}
+        for i in range(1, schools + 1)
+    ]
+    student_rows = []
+    enrollment_rows = []
+    invoice_rows = []
+    for school in school_rows:
+        for _ in range(students_per_school):
+            student_id = len(student_rows) + 1
+            student_rows.append(
+                {
+                    "id": student_id,
+                    "first_name": "Student",
+                    "last_name": str(student_id),
+                    "email": f"student{student_id}@bench.com",
+                    "age": 10 + student_id % 8,
+                    "created_at": now,
+                }
+            )
+            enrollment_rows.append(
+                {
+                    "school_id": school["id"],
+                    "student_id": student_id,
+                    "date_joined": now,
+                    "status": StudentStatus.ACTIVE.value,
+                }
+            )
+            for month in range(invoices_per_student):
+                invoice_id = len(invoice_rows) + 1
+                invoice_rows.append(
+                    {
+                        "id": invoice_id,
+                        "ref": f"INV{invoice_id:09d}",
+                        "student_id": student_id,
+                        "school_id": school["id"],
+                        "value": Decimal("100.00"),
+                        "date": now - timedelta(days=30 * month),
+                        "status": (
+                            InvoiceStatus.PENDING if month % 3 else InvoiceStatus.PAID
+                        ),
+                        "created_at": now - timedelta(days=30 * month),
+                    }
+                )
+
+    async with session_factory(engine)() as session:
+        await _insert_batches(session, SchoolTable, school_rows)
+        await _insert_batches(session, StudentTable, student_rows)
+        await _insert_batches(session, SchoolStudentsTable, enrollment_rows)
+        await _insert_batches(session, InvoiceTable, invoice_rows)
+        await session.commit()
+        await rebuild_balances(session)
+
+
+async def measure(
+    func: Callable[[], Awaitable[object]], *, repeat: int = 20, warmup: int = 2
+) -> dict[str, float]:
+    """Run ``func`` several times and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        await func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "max_ms": timings[-1],
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, ``q`` between 0 and 100, of sorted ``values``."""
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def _format(value: object) -> str:
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    cells = [[_format(value) for value in row] for row in rows]
+    widths = [
+        max(len(value) for value in [header, *column])
+        for header, column in zip(headers, zip(*cells))
+    ]
+    print("  ".join(header.rjust(width) for header, width in zip(headers, widths)))
+    for row in cells:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
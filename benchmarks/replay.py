@@ -0,0 +1,316 @@
+"""Replay recorded request traffic against the app and report it per route.
+
+Run with ``python -m benchmarks.replay traffic.jsonl``. Every line of the file
+is one request::
+
+    {"method": "GET", "path": "/students/12", "query": {"size": 50}}
+    {"method": "POST", "path": "/invoices/payments", "body": {...}, "at": 1.25}
+    {"method": "POST", "path": "/invoices/bulk", "content": "{...}\n{...}\n",
+     "content_type": "application/x-ndjson"}
+
+``query`` may also be a query string, ``headers`` are optional and ``at`` is
+the second the request arrived at, relative to any origin. ``body`` is sent as
+JSON. Other payloads, such as the CSV of ``/invoices/payments/import`` or the
+NDJSON of ``/invoices/bulk``, are recorded as the raw text in ``content``
+with their ``content_type`` and sent byte for byte.
+
+Requests go to ``main:app`` in process through ``httpx.ASGITransport``, using
+the database of ``DATABASE_URL``, or to a running server with ``--base-url``.
+``--concurrency`` caps the requests in flight. Without an arrival rate every
+worker sends its next request as soon as the previous one is answered
+(closed loop). ``--rate`` sends requests at a fixed rate per second, or with
+exponential gaps when ``--poisson`` is given, and ``--speed`` follows the
+recorded ``at`` times, ``--speed 2`` twice as fast. With an arrival schedule
+latency is measured from the time a request was due, so requests that waited
+for a free worker show up in the percentiles instead of hiding the backlog.
+
+The report has throughput, p50/p95/p99 latency, 4xx responses and errors
+(5xx responses and transport failures) per route template.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import httpx
+from starlette.routing import compile_path
+
+from benchmarks.common import percentile, print_table
+
+
+@dataclass(frozen=True)
+class RecordedRequest:
+    method: str
+    path: str
+    query: Any = None
+    body: Any = None
+    content: Optional[bytes] = None
+    headers: Optional[dict[str, str]] = None
+    at: Optional[float] = None
+
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def client_errors(self) -> int:
+        return sum(n for status, n in self.statuses.items() if 400 <= status < 500)
+
+    @property
+    def failures(self) -> int:
+        """5xx responses and requests that got no response at all."""
+        return self.errors + sum(
+            n for status, n in self.statuses.items() if status >= 500
+        )
+
+
+def load_requests(path: str) -> list[RecordedRequest]:
+    requests = []
+    with open(path) as file:
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                headers = record.get("headers")
+                content = record.get("content")
+                if content is not None:
+                    if record.get("body") is not None:
+                        raise ValueError("both 'body' and 'content' are set")
+                    content = content.encode()
+                    if "content_type" in record:
+                        headers = {
+                            **(headers or {}),
+                            "content-type": record["content_type"],
+                        }
+                requests.append(
+                    RecordedRequest(
+                        method=record.get("method", "GET").upper(),
+                        path=record["path"],
+                        query=record.get("query"),
+                        body=record.get("body"),
+                        content=content,
+                        headers=headers,
+                        at=record.get("at"),
+                    )
+                )
+            except (ValueError, KeyError, AttributeError) as e:
+                raise ValueError(f"{path}:{number}: invalid request ({e})") from e
+    return requests
+
+
+def schedule(
+    requests: list[RecordedRequest],
+    *,
+    rate: Optional[float] = None,
+    poisson: bool = False,
+    speed: Optional[float] = None,
+    seed: int = 0,
+) -> list[Optional[float]]:
+    """Seconds after the start each request is due, ``None`` for closed loop."""
+    if rate:
+        rng = random.Random(seed)
+        offsets, offset = [], 0.0
+        for _ in requests:
+            offsets.append(offset)
+            offset += rng.expovariate(rate) if poisson else 1 / rate
+        return offsets
+    if speed:
+        if any(request.at is None for request in requests):
+            raise ValueError("--speed needs an 'at' time on every request")
+        first = min(request.at for request in requests)
+        return [(request.at - first) / speed for request in requests]
+    return [None] * len(requests)
+
+
+def route_matcher(app) -> Callable[[str, str], str]:
+    """Map a method and path to the matching path template of ``app``.
+
+    Templates come from the OpenAPI schema in declaration order, the order
+    the router tries them in, so ``/schools/debt`` is not taken for
+    ``/schools/{school_id}``.
+    """
+    templates = [
+        (compile_path(template)[0], template, {method.upper() for method in methods})
+        for template, methods in app.openapi()["paths"].items()
+    ]
+    cache: dict[tuple[str, str], str] = {}
+
+    def route_of(method: str, path: str) -> str:
+        key = (method, path)
+        if key not in cache:
+            cache[key] = next(
+                (
+                    f"{method} {template}"
+                    for regex, template, methods in templates
+                    if method in methods and regex.match(path)
+                ),
+                f"{method} unmatched",
+            )
+        return cache[key]
+
+    return route_of
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    requests: list[RecordedRequest],
+    offsets: list[Optional[float]],
+    *,
+    concurrency: int,
+    route_of: Callable[[str, str], str],
+) -> tuple[dict[str, RouteStats], float]:
+    """Send ``requests`` and return the stats per route and the elapsed seconds."""
+    stats: dict[str, RouteStats] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in zip(requests, offsets):
+        queue.put_nowait(item)
+    started = time.perf_counter()
+
+    async def worker() -> None:
+        while not queue.empty():
+            request, offset = queue.get_nowait()
+            if offset is None:
+                due = time.perf_counter()
+            else:
+                due = started + offset
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            route = stats.setdefault(
+                route_of(request.method, request.path), RouteStats()
+            )
+            try:
+                response = await client.request(
+                    request.method,
+                    request.path,
+                    params=request.query,
+                    json=request.body,
+                    content=request.content,
+                    headers=request.headers,
+                )
+                await response.aread()
+                route.statuses[response.status_code] += 1
+            except httpx.HTTPError:
+                route.errors += 1
+            route.latencies.append(time.perf_counter() - due)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def report_rows(stats: dict[str, RouteStats], elapsed: float) -> list[list[object]]:
+    total = RouteStats()
+    for route in stats.values():
+        total.latencies += route.latencies
+        total.statuses += route.statuses
+        total.errors += route.errors
+
+    rows = []
+    for name, route in [*sorted(stats.items()), ("total", total)]:
+        latencies = sorted(latency * 1000 for latency in route.latencies)
+        rows.append(
+            [
+                name,
+                route.requests,
+                route.requests / elapsed,
+                percentile(latencies, 50),
+                percentile(latencies, 95),
+                percentile(latencies, 99),
+                route.client_errors,
+                f"{route.failures / route.requests:.1%}",
+            ]
+        )
+    return rows
+
+
+async def main(args: argparse.Namespace) -> int:
+    requests = load_requests(args.path) * args.loops
+    if not requests:
+        print(f"❌ {args.path} has no requests")
+        return 1
+    offsets = schedule(
+        requests, rate=args.rate, poisson=args.poisson, speed=args.speed, seed=args.seed
+    )
+
+    # imported late: the app reads DATABASE_URL and the pool settings on import
+    from main import app
+
+    if args.base_url:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=args.concurrency)
+        )
+        base_url = args.base_url
+    else:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://replay"
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=args.timeout
+    ) as client:
+        stats, elapsed = await replay(
+            client,
+            requests,
+            offsets,
+            concurrency=args.concurrency,
+            route_of=route_matcher(app),
+        )
+
+    rows = report_rows(stats, elapsed)
+    print_table(
+        ["route", "requests", "rps", "p50_ms", "p95_ms", "p99_ms", "4xx", "errors"],
+        rows,
+    )
+    print(f"\n{len(requests)} requests in {elapsed:.2f}s")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "elapsed": elapsed,
+                    "routes": {
+                        name: {
+                            "requests": route.requests,
+                            "statuses": {
+                                str(code): n for code, n in route.statuses.items()
+                            },
+                            "errors": route.errors,
+                            "latencies_ms": [
+                                latency * 1000 for latency in route.latencies
+                            ],
+                        }
+                        for name, route in stats.items()
+                    },
+                },
+                file,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", help="JSONL file with one request per line")
+    parser.add_argument("--base-url", help="replay against a running server")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate", type=float, help="requests per second")
+    parser.add_argument(
+        "--poisson", action="store_true", help="exponential gaps at --rate"
+    )
+    parser.add_argument("--speed", type=float, help="follow the recorded 'at' times")
+    parser.add_argument("--loops", type=int, default=1, help="replay the file N times")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="write every latency as JSON to this file")
+    sys.exit(asyncio.run(main(parser.parse_args())))
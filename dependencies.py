@@ -1,10 +1,12 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from domain.services.school_services import SchoolService
 from domain.services.student_services import StudentService
 from infrastructure.database.db_engine import AsyncSessionLocal
+from infrastructure.database.unit_of_work import UnitOfWork
 from infrastructure.repositories.postgres import (
     PostgresRepository,
     StudentRepository,
@@ -12,21 +14,48 @@ from infrastructure.repositories.postgres import (
     InvoiceRepository,
 )
 
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
 
-def get_student_repository() -> StudentRepository:
-    return StudentRepository(session_factory=AsyncSessionLocal)
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return AsyncSessionLocal
 
-def get_school_repository() -> SchoolRepository:
-    return SchoolRepository(session_factory=AsyncSessionLocal)
 
+async def get_unit_of_work(
+    request: Request,
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+) -> AsyncIterator[UnitOfWork]:
+    """One session for every repository and service used by the request."""
+    async with UnitOfWork(
+        session_factory, read_only=request.method in READ_ONLY_METHODS
+    ) as uow:
+        yield uow
 
-def get_invoice_repository() -> InvoiceRepository:
-    return InvoiceRepository(session_factory=AsyncSessionLocal)
 
+def get_student_repository(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> StudentRepository:
+    return StudentRepository(session_factory=uow)
 
-def get_repository() -> PostgresRepository:
-    return PostgresRepository(session_factory=AsyncSessionLocal)
+
+def get_school_repository(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> SchoolRepository:
+    return SchoolRepository(session_factory=uow)
+
+
+def get_invoice_repository(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> InvoiceRepository:
+    return InvoiceRepository(session_factory=uow)
+
+
+def get_repository(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> PostgresRepository:
+    return PostgresRepository(session_factory=uow)
 
 
 def get_school_service(
@@ -1,7 +1,8 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from pydantic import BaseModel, field_serializer
+from typing import Optional, Union
+from pydantic import BaseModel
 from .school import School
 from .student import Student
 
@@ -11,25 +12,21 @@ class InvoiceStatus(str, Enum):
     PAID = "PAID"
 
 
+# Relationships that can be requested with the expand query parameter
+INVOICE_EXPANDABLE = frozenset({"student", "school"})
+
+
 class Invoice(BaseModel):
     id: int
     ref: str
-    student: Student
-    school: School
+    # Only the related id unless the invoice is read with expand=student,school
+    student: Union[int, Student]
+    school: Union[int, School]
     value: Decimal
     date: datetime
     status: InvoiceStatus
     created_at: datetime
 
-    # TODO: define a better serialization strategy here
-    @field_serializer("school")
-    def serialize_school(self, school: School):
-        return school.id
-
-    @field_serializer("student")
-    def serialize_student(self, student: Student):
-        return student.id
-
 
 class Payment(BaseModel):
     id: int
@@ -38,3 +35,20 @@ class Payment(BaseModel):
     value: Decimal
     date: datetime
     created_at: datetime
+
+
+class BulkRowError(BaseModel):
+    # index is the position of the row in the submitted batch
+    index: int
+    ref: Optional[str] = None
+    detail: str
+
+
+class PaymentImportReport(BaseModel):
+    rows: int = 0
+    imported: int = 0
+    error_count: int = 0
+    # only the first errors are kept so a bad file can't exhaust memory
+    errors: list[BulkRowError] = []
+    seconds: float = 0
+    rows_per_sec: float = 0
@@ -0,0 +1,11 @@
+from typing import Generic, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    # next_cursor is None once the last page has been reached
+    items: list[T]
+    size: int
+    next_cursor: Optional[str] = None
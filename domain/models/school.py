@@ -17,3 +17,18 @@ class School(BaseModel):
 class SchoolCreate(BaseModel):
     ref: str
     name: str
+
+
+# Fields GET /schools/debt can be sorted by, prefix with "-" for descending
+SCHOOL_DEBT_SORTABLE = frozenset(
+    {"id", "name", "total_debt", "pending_invoices", "oldest_pending_date"}
+)
+
+
+class SchoolDebt(BaseModel):
+    id: int
+    ref: str
+    name: str
+    total_debt: Decimal
+    pending_invoices: int
+    oldest_pending_date: Optional[datetime] = None
@@ -2,7 +2,7 @@ from enum import Enum
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from pydantic import field_validator
 
 
@@ -19,6 +19,13 @@ class StudentCreate(BaseModel):
     age: int
 
 
+FINANCIAL_STATUS_BATCH_MAX_IDS = 1000
+
+
+class StudentIdsBatch(BaseModel):
+    ids: list[int] = Field(max_length=FINANCIAL_STATUS_BATCH_MAX_IDS)
+
+
 class Student(BaseModel):
     id: int
     first_name: str
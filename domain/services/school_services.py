@@ -1,12 +1,14 @@
-from typing import Any, Mapping
-from decimal import Decimal
+from typing import Any, Mapping, Optional
 
-from domain.models.school import School
+from domain.models.school import School, SchoolDebt
 from domain.models.student import StudentStatus
-from domain.models.invoice import InvoiceStatus
 from infrastructure.repositories.base import BaseRepository
 
 
+def _status_filter(active: bool) -> str:
+    return StudentStatus.ACTIVE.value if active else StudentStatus.DEACTIVATED.value
+
+
 class SchoolService:
     def __init__(self, repository: BaseRepository):
         self.repository = repository
@@ -26,13 +28,9 @@ class SchoolService:
         # TODO: should we replace this with a specific get_school_by_id method?
         school = schools[0]
 
-        status_filter = (
-            StudentStatus.ACTIVE.value if active else StudentStatus.DEACTIVATED.value
-        )
-
         students, total_students = await self.repository.get_students(
             school_id=school.id,
-            status=status_filter,
+            status=_status_filter(active),
             offset=offset,
             limit=limit,
         )
@@ -40,19 +38,22 @@ class SchoolService:
         school.students = students
         return school, total_students
 
-    # TODO: this might be better as an SQL query
-    async def get_school_debt(self, *, school_id: int) -> School:
-        schools, _ = await self.repository.get_schools(filters={"id": school_id})
-        if not schools:
-            return None
-        school = schools[0]
+    async def get_school_students_version(
+        self, *, school_id: int, active: bool = True
+    ) -> Optional[tuple[int, ...]]:
+        # changes whenever get_school_students would return other students
+        return await self.repository.get_school_students_version(
+            school_id, status=_status_filter(active)
+        )
 
-        invoices, _ = await self.repository.get_invoices(school_id=school.id)
+    async def get_school_debt(self, *, school_id: int) -> Optional[School]:
+        # total_debt is read from the school_balances ledger, kept up to date by
+        # every invoice and payment write
+        return await self.repository.get_school_debt(school_id)
 
-        pending_invoices = list(
-            filter(lambda invoice: invoice.status == InvoiceStatus.PENDING, invoices)
+    async def get_schools_debt(
+        self, *, sort: str = "-total_debt", offset: int = 0, limit: int = 10
+    ) -> tuple[list[SchoolDebt], int]:
+        return await self.repository.get_schools_debt(
+            sort=sort, offset=offset, limit=limit
         )
-        total_debt = sum(inv.value for inv in pending_invoices)
-
-        school.total_debt = Decimal(total_debt)
-        return school
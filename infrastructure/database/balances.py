@@ -0,0 +1,215 @@
+"""Student and school balance ledger.
+
+``student_balances`` and ``school_balances`` hold the running ``total_paid``
+and ``total_debt`` of every student and school so reads are a primary key
+lookup. The invoice repository applies a ``BalanceDelta`` inside the same
+transaction as every invoice or payment it creates or deletes. Migration
+``m0003_balance_ledger`` fills the ledger from the invoices and payments
+already in the database. Rows written by other means afterwards (fixtures,
+manual SQL) require a rebuild.
+
+Usage:
+    python -m infrastructure.database.balances rebuild
+    python -m infrastructure.database.balances check
+"""
+
+import argparse
+import asyncio
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import Select, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.db_engine import AsyncSessionLocal
+from infrastructure.database.orm import (
+    INVOICE_IS_PENDING,
+    InvoiceTable,
+    PaymentTable,
+    SchoolBalanceTable,
+    StudentBalanceTable,
+)
+
+ZERO = Decimal("0.00")
+
+
+@dataclass(frozen=True)
+class BalanceDelta:
+    student_id: int
+    school_id: int
+    paid: Decimal = ZERO
+    debt: Decimal = ZERO
+
+
+@dataclass(frozen=True)
+class BalanceMismatch:
+    scope: str
+    id: int
+    expected_paid: Decimal
+    actual_paid: Decimal
+    expected_debt: Decimal
+    actual_debt: Decimal
+
+
+def _upsert(session: AsyncSession, table):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Balance upserts are not supported on {dialect}")
+
+
+async def _apply(
+    session: AsyncSession, table, key: str, totals: dict[int, list[Decimal]]
+) -> None:
+    if not totals:
+        return
+
+    now = datetime.now()
+    stmt = _upsert(session, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={
+            "total_paid": table.total_paid + stmt.excluded.total_paid,
+            "total_debt": table.total_debt + stmt.excluded.total_debt,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    # Rows are locked in id order, so concurrent transactions touching the same
+    # students or schools wait for each other instead of deadlocking
+    await session.execute(
+        stmt,
+        [
+            {key: id_, "total_paid": paid, "total_debt": debt, "updated_at": now}
+            for id_, (paid, debt) in sorted(totals.items())
+        ],
+    )
+
+
+async def apply_balance_deltas(
+    session: AsyncSession, deltas: Iterable[BalanceDelta]
+) -> None:
+    """Add ``deltas`` to the ledger without committing.
+
+    Deltas are merged per student and per school first, so a batch touching
+    the same student many times costs a single upsert row.
+    """
+    students: dict[int, list[Decimal]] = defaultdict(lambda: [ZERO, ZERO])
+    schools: dict[int, list[Decimal]] = defaultdict(lambda: [ZERO, ZERO])
+    for delta in deltas:
+        for totals in (students[delta.student_id], schools[delta.school_id]):
+            totals[0] += delta.paid
+            totals[1] += delta.debt
+
+    await _apply(session, StudentBalanceTable, "student_id", students)
+    await _apply(session, SchoolBalanceTable, "school_id", schools)
+
+
+def _totals_query(owner_column) -> Select:
+    """Aggregate paid and pending totals from invoices and payments."""
+    paid_per_invoice = (
+        select(PaymentTable.invoice_id, func.sum(PaymentTable.value).label("paid"))
+        .group_by(PaymentTable.invoice_id)
+        .subquery()
+    )
+    return (
+        select(
+            owner_column,
+            func.coalesce(func.sum(paid_per_invoice.c.paid), 0).label("total_paid"),
+            func.coalesce(
+                func.sum(InvoiceTable.value).filter(INVOICE_IS_PENDING),
+                0,
+            ).label("total_debt"),
+        )
+        .outerjoin(paid_per_invoice, paid_per_invoice.c.invoice_id == InvoiceTable.id)
+        .group_by(owner_column)
+    )
+
+
+async def rebuild_balances(session: AsyncSession) -> None:
+    """Recompute both ledgers from invoices and payments and commit."""
+    now = datetime.now()
+    for table, key, owner_column in (
+        (StudentBalanceTable, "student_id", InvoiceTable.student_id),
+        (SchoolBalanceTable, "school_id", InvoiceTable.school_id),
+    ):
+        totals = _totals_query(owner_column).subquery()
+        await session.execute(delete(table))
+        await session.execute(
+            insert(table).from_select(
+                [key, "total_paid", "total_debt", "updated_at"],
+                select(
+                    totals.c[owner_column.key],
+                    totals.c.total_paid,
+                    totals.c.total_debt,
+                    literal(now, table.updated_at.type),
+                ),
+            )
+        )
+    await session.commit()
+
+
+async def check_balances(session: AsyncSession) -> list[BalanceMismatch]:
+    """Compare the ledgers with freshly aggregated totals."""
+    mismatches = []
+    for scope, table, key, owner_column in (
+        ("student", StudentBalanceTable, "student_id", InvoiceTable.student_id),
+        ("school", SchoolBalanceTable, "school_id", InvoiceTable.school_id),
+    ):
+        expected = {
+            row[0]: (Decimal(row.total_paid), Decimal(row.total_debt))
+            for row in await session.execute(_totals_query(owner_column))
+        }
+        actual = {
+            row[0]: (row.total_paid, row.total_debt)
+            for row in await session.execute(
+                select(getattr(table, key), table.total_paid, table.total_debt)
+            )
+        }
+        for id_ in sorted(expected.keys() | actual.keys()):
+            expected_paid, expected_debt = expected.get(id_, (ZERO, ZERO))
+            actual_paid, actual_debt = actual.get(id_, (ZERO, ZERO))
+            if (expected_paid, expected_debt) != (actual_paid, actual_debt):
+                mismatches.append(
+                    BalanceMismatch(
+                        scope=scope,
+                        id=id_,
+                        expected_paid=expected_paid,
+                        actual_paid=actual_paid,
+                        expected_debt=expected_debt,
+                        actual_debt=actual_debt,
+                    )
+                )
+    return mismatches
+
+
+async def main(command: str) -> int:
+    async with AsyncSessionLocal() as session:
+        if command == "rebuild":
+            await rebuild_balances(session)
+            print("✅ Balances rebuilt")
+            return 0
+
+        mismatches = await check_balances(session)
+        for mismatch in mismatches:
+            print(
+                f"❌ {mismatch.scope} {mismatch.id}: "
+                f"paid {mismatch.actual_paid} != {mismatch.expected_paid}, "
+                f"debt {mismatch.actual_debt} != {mismatch.expected_debt}"
+            )
+        if not mismatches:
+            print("✅ Balances are consistent")
+        return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the balance ledger")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.command)))
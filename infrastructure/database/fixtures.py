@@ -2,6 +2,7 @@ import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from infrastructure.database.balances import rebuild_balances
 from infrastructure.database.db_engine import AsyncSessionLocal, engine, Base
 from infrastructure.database.orm import (
     StudentTable,
@@ -566,6 +567,7 @@ async def populate_database():
 
         session.add_all(payments)
         await session.commit()
+        await rebuild_balances(session)
 
         print("✅ Database populated successfully!")
         print(f"   - {len(schools)} schools")
@@ -0,0 +1,291 @@
+"""Bulk payment import from bank settlement CSV files.
+
+The file is parsed as it is read and inserted in chunks: every chunk resolves
+its invoice refs with one query and is written in its own transaction, so
+memory stays flat and a bad chunk does not roll back the ones before it.
+The expected header is ``ref,invoice_ref,value,date``.
+
+Usage:
+    python -m infrastructure.database.import_payments payments.csv
+    python -m infrastructure.database.import_payments payments.csv --chunk-size 10000
+"""
+
+import argparse
+import asyncio
+import codecs
+import csv
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterable, AsyncIterator, Callable, Optional
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from domain.models.invoice import BulkRowError, PaymentImportReport
+from infrastructure.database.db_engine import AsyncSessionLocal
+from infrastructure.repositories.postgres import InvoiceRepository
+
+CSV_COLUMNS = ("ref", "invoice_ref", "value", "date")
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+MAX_RECORD_LINES = 100
+
+
+class PaymentImportError(ValueError):
+    """Raised when the file can not be imported at all."""
+
+
+class PaymentImportRow(BaseModel):
+    ref: str
+    invoice_ref: str
+    value: Decimal
+    date: datetime
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a stream of byte chunks into text lines.
+
+    Decoding is incremental, so a multi-byte character or a line split across
+    two chunks is handled, and a UTF-8 BOM (common in spreadsheet exports) is
+    dropped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _ends_in_quoted_field(line: str, quoted: bool) -> bool:
+    """Whether ``line`` ends inside a quoted field, following the csv module.
+
+    A quote only opens a field when it is the field's first character, one
+    anywhere else is kept as a literal character.
+    """
+    if not quoted and '"' not in line:
+        return False
+    at_field_start = not quoted
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if quoted:
+            if char == '"':
+                if line[i + 1 : i + 2] == '"':
+                    i += 1
+                else:
+                    quoted = False
+        elif char == '"' and at_field_start:
+            quoted = True
+        at_field_start = char == "," and not quoted
+        i += 1
+    return quoted
+
+
+class _RecordReader:
+    """Group lines into CSV records, a quoted field may span several lines.
+
+    Records are returned as their values, or ``None`` for a line that opens a
+    quoted field that is not closed within ``MAX_RECORD_LINES`` lines or by
+    the end of the file. The lines after it are then read again as records
+    of their own, so one stray quote costs one row.
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.quoted = False
+
+    def push(self, line: str) -> list[Optional[list[str]]]:
+        if not self.lines and not line.strip():
+            return []
+        self.lines.append(line)
+        self.quoted = _ends_in_quoted_field(line, self.quoted)
+        if not self.quoted:
+            record, self.lines = self.lines, []
+            return [next(csv.reader(f"{line}\n" for line in record))]
+        if len(self.lines) > MAX_RECORD_LINES:
+            return self._skip_unterminated()
+        return []
+
+    def finish(self) -> list[Optional[list[str]]]:
+        records: list[Optional[list[str]]] = []
+        while self.lines:
+            records += self._skip_unterminated()
+        return records
+
+    def _skip_unterminated(self) -> list[Optional[list[str]]]:
+        rest, self.lines, self.quoted = self.lines[1:], [], False
+        records: list[Optional[list[str]]] = [None]
+        for line in rest:
+            records += self.push(line)
+        return records
+
+
+async def _iter_records(
+    lines: AsyncIterable[str],
+) -> AsyncIterator[Optional[list[str]]]:
+    reader = _RecordReader()
+    async for line in lines:
+        for values in reader.push(line):
+            yield values
+    for values in reader.finish():
+        yield values
+
+
+async def iter_rows(lines: AsyncIterable[str]) -> AsyncIterator[dict | BulkRowError]:
+    """Yield each CSV record as a dict, or a ``BulkRowError`` if it is invalid.
+
+    Records are indexed from 0 after the header and blank lines are skipped.
+    A quoted field may span up to ``MAX_RECORD_LINES`` lines, a quote that is
+    never closed is reported as an error for the line that opened it.
+    """
+    header = None
+    index = 0
+    async for values in _iter_records(lines):
+        if values is None and header is None:
+            raise PaymentImportError("Unterminated quoted field in the header")
+        if header is None:
+            header = [name.strip() for name in values]
+            missing = set(CSV_COLUMNS) - set(header)
+            if missing:
+                raise PaymentImportError(
+                    f"Missing CSV column(s): {', '.join(sorted(missing))}"
+                )
+            continue
+
+        if values is None:
+            yield BulkRowError(index=index, detail="Unterminated quoted field")
+        elif len(values) != len(header):
+            yield BulkRowError(
+                index=index,
+                detail=f"Expected {len(header)} columns, got {len(values)}",
+            )
+        else:
+            record = dict(zip(header, values))
+            try:
+                yield PaymentImportRow.model_validate(record).model_dump()
+            except ValidationError as e:
+                yield BulkRowError(
+                    index=index,
+                    ref=record.get("ref") or None,
+                    detail="; ".join(
+                        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                        for err in e.errors(include_url=False)
+                    ),
+                )
+        index += 1
+
+    if header is None:
+        raise PaymentImportError("The file is empty")
+
+
+async def import_payments(
+    repo: InvoiceRepository,
+    chunks: AsyncIterable[bytes],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[PaymentImportReport], None]] = None,
+) -> PaymentImportReport:
+    """Import every payment in a CSV byte stream, ``chunk_size`` rows at a time.
+
+    Only the first ``MAX_REPORTED_ERRORS`` errors are kept in the report,
+    ``error_count`` has the total.
+    """
+    report = PaymentImportReport()
+    started = time.perf_counter()
+
+    def add_errors(errors: list[BulkRowError]) -> None:
+        report.error_count += len(errors)
+        room = MAX_REPORTED_ERRORS - len(report.errors)
+        report.errors.extend(errors[: max(room, 0)])
+
+    async def flush(batch: list[dict], positions: list[int]) -> None:
+        try:
+            imported, errors = await repo.create_payments_bulk(batch)
+        except IntegrityError:
+            imported = 0
+            errors = [
+                BulkRowError(
+                    index=index,
+                    ref=row["ref"],
+                    detail="Chunk conflicts with concurrent writes",
+                )
+                for index, row in enumerate(batch)
+            ]
+        report.imported += imported
+        add_errors(
+            [
+                error.model_copy(update={"index": positions[error.index]})
+                for error in errors
+            ]
+        )
+        report.seconds = time.perf_counter() - started
+        report.rows_per_sec = report.rows / report.seconds if report.seconds else 0
+        if on_progress:
+            on_progress(report)
+
+    batch: list[dict] = []
+    positions: list[int] = []
+    async for row in iter_rows(iter_lines(chunks)):
+        report.rows += 1
+        if isinstance(row, BulkRowError):
+            add_errors([row])
+            continue
+        batch.append(row)
+        positions.append(report.rows - 1)
+        if len(batch) >= chunk_size:
+            await flush(batch, positions)
+            batch, positions = [], []
+
+    if batch:
+        await flush(batch, positions)
+    report.seconds = time.perf_counter() - started
+    report.rows_per_sec = report.rows / report.seconds if report.seconds else 0
+    report.errors.sort(key=lambda error: error.index)
+    return report
+
+
+async def _read_file(path: str, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+def _print_progress(report: PaymentImportReport) -> None:
+    print(
+        f"   {report.rows} rows, {report.imported} imported, "
+        f"{report.error_count} errors ({report.rows_per_sec:,.0f} rows/s)"
+    )
+
+
+async def main(path: str, chunk_size: int) -> int:
+    repo = InvoiceRepository(session_factory=AsyncSessionLocal)
+    try:
+        report = await import_payments(
+            repo, _read_file(path), chunk_size=chunk_size, on_progress=_print_progress
+        )
+    except PaymentImportError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for error in report.errors:
+        print(f"❌ row {error.index} ({error.ref or '-'}): {error.detail}")
+    print(
+        f"✅ Imported {report.imported} of {report.rows} payments "
+        f"in {report.seconds:.2f}s ({report.rows_per_sec:,.0f} rows/s)"
+    )
+    return 1 if report.error_count else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import payments from a CSV file")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.path, args.chunk_size)))
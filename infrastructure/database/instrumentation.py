@@ -0,0 +1,81 @@
+"""Per-request SQL statement counting through SQLAlchemy engine events.
+
+``instrument_engine`` times every statement an engine executes and feeds the
+``db_*`` metrics. While ``track_queries()`` is active, typically for the
+duration of one HTTP request, the statements are also added to a
+``QueryStats`` kept in a context variable. SQLAlchemy runs the events in the
+same context as the awaiting task, so each request only sees its own
+statements. Requests profiled by ``infrastructure.profiler`` also get a record
+of every statement.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.metrics import DB_QUERIES, DB_QUERY_DURATION
+from infrastructure.profiler import StatementRecord, current_profile
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(elapsed)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    profile = current_profile()
+    if profile is not None:
+        profile.statements.append(StatementRecord(statement, elapsed, executemany))
+
+
+def _handle_error(context) -> None:
+    started = (
+        context.connection.info.get("query_started") if context.connection else None
+    )
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,98 @@
+"""Versioned schema migrations.
+
+Every ``mNNNN_<name>.py`` module in this package exposes a synchronous
+``upgrade(connection)`` function. Applied versions are recorded in the
+``schema_migrations`` table, so running ``migrate`` again only applies the
+missing ones. Run them with ``python -m infrastructure.database.migrations``.
+
+Migrations declare the tables, indexes and SQL they need themselves instead
+of importing the ORM, so replaying one later builds the same objects it did
+when it was written.
+"""
+
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Kept apart from Base.metadata so create_all never touches it
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module: ModuleType
+
+
+def load_migrations() -> list[Migration]:
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        if not info.name.startswith("m") or not info.name[1:5].isdigit():
+            continue
+        module = importlib.import_module(f"{__name__}.{info.name}")
+        migrations.append(
+            Migration(version=int(info.name[1:5]), name=info.name[6:], module=module)
+        )
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def _applied_versions(connection: Connection) -> set[int]:
+    migration_metadata.create_all(connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _upgrade(connection: Connection, target: Optional[int]) -> list[Migration]:
+    applied = _applied_versions(connection)
+    pending = [
+        migration
+        for migration in load_migrations()
+        if migration.version not in applied
+        and (target is None or migration.version <= target)
+    ]
+    for migration in pending:
+        migration.module.upgrade(connection)
+        connection.execute(
+            insert(schema_migrations).values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.now(),
+            )
+        )
+    return pending
+
+
+async def migrate(engine: AsyncEngine, target: Optional[int] = None) -> list[Migration]:
+    """Apply pending migrations up to ``target`` in a single transaction."""
+    async with engine.begin() as conn:
+        return await conn.run_sync(_upgrade, target)
+
+
+async def current_version(engine: AsyncEngine) -> int:
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(_applied_versions)
+    return max(applied, default=0)
@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+
+from infrastructure.database.db_engine import engine
+from infrastructure.database.migrations import current_version, migrate
+
+
+async def main(command: str, target: int | None) -> None:
+    if command == "current":
+        print(f"Schema version: {await current_version(engine)}")
+        return
+
+    applied = await migrate(engine, target=target)
+    for migration in applied:
+        print(f"✅ Applied {migration.version:04d} {migration.name}")
+    if not applied:
+        print("✅ Schema is up to date")
+    print(f"Schema version: {await current_version(engine)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("command", choices=["upgrade", "current"], nargs="?")
+    parser.add_argument("--target", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.command or "upgrade", args.target))
@@ -0,0 +1,80 @@
+"""Tables that main.on_startup used to create with Base.metadata.create_all.
+
+The tables are spelled out as they were at the time rather than taken from
+the ORM, so later model changes do not leak into this migration.
+"""
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+)
+
+metadata = MetaData()
+
+Table(
+    "students",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("first_name", String, nullable=False),
+    Column("last_name", String, nullable=False),
+    Column("email", String, nullable=False, unique=True),
+    Column("age", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "schools",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("ref", String, nullable=False, unique=True),
+    Column("name", String, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "school_students",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("school_id", ForeignKey("schools.id"), nullable=False),
+    Column("student_id", ForeignKey("students.id"), nullable=False),
+    Column("date_joined", DateTime, nullable=False),
+    Column("status", String, nullable=False),
+)
+
+Table(
+    "invoices",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("ref", String, nullable=False, unique=True),
+    Column("value", Numeric(10, 2), nullable=False),
+    Column("date", DateTime, nullable=False),
+    # SAEnum(InvoiceStatus) stores the member names
+    Column("status", Enum("PENDING", "PAID", name="invoicestatus"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("student_id", ForeignKey("students.id"), nullable=False),
+    Column("school_id", ForeignKey("schools.id"), nullable=False),
+)
+
+Table(
+    "payments",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("ref", String, nullable=False, unique=True),
+    Column("value", Numeric(10, 2), nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("invoice_id", ForeignKey("invoices.id"), nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    # checkfirst keeps this a no-op on databases created by create_all
+    metadata.create_all(connection, checkfirst=True)
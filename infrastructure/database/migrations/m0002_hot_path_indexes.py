@@ -0,0 +1,72 @@
+"""Secondary indexes for the repository lookup, pagination and debt queries.
+
+The indexes are spelled out here rather than taken from the ORM, so later
+model changes do not change what this migration creates. The tables only
+list the columns the indexes use.
+"""
+
+from sqlalchemy import Column, Connection, Index, Integer, MetaData, Table, text
+
+metadata = MetaData()
+
+invoices = Table(
+    "invoices",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("created_at"),
+    Column("school_id"),
+    Column("student_id"),
+    Column("date"),
+    Column("value"),
+)
+payments = Table(
+    "payments",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("invoice_id"),
+    Column("value"),
+)
+school_students = Table(
+    "school_students",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("school_id"),
+    Column("status"),
+    Column("student_id"),
+)
+
+INDEXES = [
+    Index("ix_invoices_created_at_id", invoices.c.created_at, invoices.c.id),
+    Index(
+        "ix_invoices_school_created_at_id",
+        invoices.c.school_id,
+        invoices.c.created_at,
+        invoices.c.id,
+    ),
+    Index(
+        "ix_invoices_student_created_at_id",
+        invoices.c.student_id,
+        invoices.c.created_at,
+        invoices.c.id,
+    ),
+    Index(
+        "ix_invoices_pending_school",
+        invoices.c.school_id,
+        invoices.c.date,
+        invoices.c.value,
+        postgresql_where=text("status = 'PENDING'"),
+        sqlite_where=text("status = 'PENDING'"),
+    ),
+    Index("ix_payments_invoice_id", payments.c.invoice_id, payments.c.value),
+    Index(
+        "ix_school_students_school_status_student",
+        school_students.c.school_id,
+        school_students.c.status,
+        school_students.c.student_id,
+    ),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for index in INDEXES:
+        index.create(connection, checkfirst=True)
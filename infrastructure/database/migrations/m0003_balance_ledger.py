@@ -0,0 +1,83 @@
+"""Balance ledger tables, filled from the invoices and payments already stored.
+
+The tables and the rebuild SQL are spelled out here rather than taken from
+the ORM and ``database/balances.py``, so later changes to either do not
+change what this migration does.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    Table,
+    bindparam,
+    text,
+)
+
+metadata = MetaData()
+
+# Only referenced by the foreign keys, created by m0001
+Table("students", metadata, Column("id", Integer, primary_key=True))
+Table("schools", metadata, Column("id", Integer, primary_key=True))
+
+student_balances = Table(
+    "student_balances",
+    metadata,
+    Column(
+        "student_id",
+        ForeignKey("students.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("total_paid", Numeric(14, 2), nullable=False),
+    Column("total_debt", Numeric(14, 2), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+school_balances = Table(
+    "school_balances",
+    metadata,
+    Column(
+        "school_id",
+        ForeignKey("schools.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("total_paid", Numeric(14, 2), nullable=False),
+    Column("total_debt", Numeric(14, 2), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+# Paid totals come from payments, debt from the invoices still pending
+REBUILD = """
+INSERT INTO {table} ({key}, total_paid, total_debt, updated_at)
+SELECT
+    invoices.{key},
+    COALESCE(SUM(paid_per_invoice.paid), 0),
+    COALESCE(SUM(CASE WHEN invoices.status = 'PENDING' THEN invoices.value END), 0),
+    :now
+FROM invoices
+LEFT OUTER JOIN (
+    SELECT invoice_id, SUM(value) AS paid FROM payments GROUP BY invoice_id
+) AS paid_per_invoice ON paid_per_invoice.invoice_id = invoices.id
+GROUP BY invoices.{key}
+"""
+
+
+def upgrade(connection: Connection) -> None:
+    # checkfirst: databases created by create_all already have the tables
+    metadata.create_all(
+        connection, tables=[student_balances, school_balances], checkfirst=True
+    )
+    now = bindparam("now", datetime.now(), type_=DateTime())
+    for table, key in (
+        ("student_balances", "student_id"),
+        ("school_balances", "school_id"),
+    ):
+        connection.execute(text(f"DELETE FROM {table}"))
+        connection.execute(text(REBUILD.format(table=table, key=key)).bindparams(now))
@@ -6,7 +6,10 @@ from sqlalchemy import (
     DateTime,
     Numeric,
     ForeignKey,
+    Index,
     Enum as SAEnum,
+    literal,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,6 +39,15 @@ class SchoolTable(Base):
 
 class SchoolStudentsTable(Base):
     __tablename__ = "school_students"
+    __table_args__ = (
+        # students of a school by enrollment status, ordered by student id
+        Index(
+            "ix_school_students_school_status_student",
+            "school_id",
+            "status",
+            "student_id",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     school_id: Mapped[int] = mapped_column(ForeignKey("schools.id"), nullable=False)
@@ -49,6 +61,21 @@ class SchoolStudentsTable(Base):
 
 class InvoiceTable(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # list and keyset pagination, optionally filtered by school or student
+        Index("ix_invoices_created_at_id", "created_at", "id"),
+        Index("ix_invoices_school_created_at_id", "school_id", "created_at", "id"),
+        Index("ix_invoices_student_created_at_id", "student_id", "created_at", "id"),
+        # covers debt aggregates over pending invoices grouped by school
+        Index(
+            "ix_invoices_pending_school",
+            "school_id",
+            "date",
+            "value",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     ref: Mapped[str] = mapped_column(String, nullable=False, unique=True)
@@ -64,8 +91,16 @@ class InvoiceTable(Base):
     school: Mapped["SchoolTable"] = relationship("SchoolTable")
 
 
+# The status is rendered inline instead of as a bound parameter so the query
+# planner can match it against the ix_invoices_pending_school partial index.
+INVOICE_IS_PENDING = InvoiceTable.status == literal(
+    InvoiceStatus.PENDING, InvoiceTable.status.type, literal_execute=True
+)
+
+
 class PaymentTable(Base):
     __tablename__ = "payments"
+    __table_args__ = (Index("ix_payments_invoice_id", "invoice_id", "value"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     ref: Mapped[str] = mapped_column(String, nullable=False, unique=True)
@@ -75,3 +110,27 @@ class PaymentTable(Base):
 
     invoice_id: Mapped[int] = mapped_column(ForeignKey("invoices.id"), nullable=False)
     invoice: Mapped["InvoiceTable"] = relationship("InvoiceTable")
+
+
+class StudentBalanceTable(Base):
+    # Ledger kept up to date by the invoice repository, see database/balances.py
+    __tablename__ = "student_balances"
+
+    student_id: Mapped[int] = mapped_column(
+        ForeignKey("students.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_paid: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    total_debt: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class SchoolBalanceTable(Base):
+    # Ledger kept up to date by the invoice repository, see database/balances.py
+    __tablename__ = "school_balances"
+
+    school_id: Mapped[int] = mapped_column(
+        ForeignKey("schools.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_paid: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    total_debt: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
@@ -0,0 +1,203 @@
+"""Connection pool settings and instrumentation.
+
+Pool settings are read from the environment and only apply to PostgreSQL
+engines; SQLite keeps the pool SQLAlchemy picks for it.
+
+Unless ``DB_POOL_SIZE``/``DB_MAX_OVERFLOW`` are given, the pool is sized from
+the connection budget of the deployment: ``DB_MAX_CONNECTIONS`` (what
+PostgreSQL allows this service, minus headroom for migrations and admin
+sessions) divided by ``WEB_CONCURRENCY`` worker processes, capped at
+SQLAlchemy's defaults of 5 + 10 overflow. Every worker has its own pool, so
+without this a deployment with many workers exhausts ``max_connections``.
+
+Settings:
+    DB_MAX_CONNECTIONS      connections all workers may open together (80)
+    WEB_CONCURRENCY         worker processes sharing that budget (1)
+    DB_POOL_SIZE            connections kept open per worker
+    DB_MAX_OVERFLOW         extra connections opened under load per worker
+    DB_POOL_TIMEOUT         seconds to wait for a connection (30)
+    DB_POOL_RECYCLE         seconds before a connection is replaced, -1 never (1800)
+    DB_POOL_PRE_PING        ping connections on checkout, true/false (true)
+    DB_STATEMENT_CACHE_SIZE             asyncpg statement cache (100)
+    DB_PREPARED_STATEMENT_CACHE_SIZE    SQLAlchemy prepared statement cache (100)
+    DB_POOL_WARMUP          connections opened at startup, at most DB_POOL_SIZE
+
+Behind PgBouncer in transaction mode both statement caches must be 0.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    size: int = DEFAULT_POOL_SIZE
+    max_overflow: int = DEFAULT_MAX_OVERFLOW
+    timeout: float = 30
+    recycle: int = 1800
+    pre_ping: bool = True
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+    warmup: int = 1
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        size, max_overflow = pool_size_for_budget(
+            max_connections=int(os.getenv("DB_MAX_CONNECTIONS", "80")),
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        )
+        size = int(os.getenv("DB_POOL_SIZE", size))
+        return cls(
+            size=size,
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", max_overflow)),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+            prepared_statement_cache_size=int(
+                os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100")
+            ),
+            warmup=min(int(os.getenv("DB_POOL_WARMUP", size)), size),
+        )
+
+
+def pool_size_for_budget(*, max_connections: int, workers: int) -> tuple[int, int]:
+    """Split a connection budget into ``(pool_size, max_overflow)`` per worker."""
+    per_worker = max(1, max_connections // max(1, workers))
+    size = min(DEFAULT_POOL_SIZE, per_worker)
+    return size, min(DEFAULT_MAX_OVERFLOW, per_worker - size)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that counts checkouts and the ones that had to wait."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+
+    def connect(self):
+        self.checkouts += 1
+        return super().connect()
+
+    def _do_get(self):
+        exhausted = self._pool.empty() and 0 <= self._max_overflow <= self._overflow
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            if exhausted:
+                self.waits += 1
+                self.wait_seconds += time.perf_counter() - started
+
+
+def engine_options(url: str, settings: PoolSettings) -> dict[str, Any]:
+    """Keyword arguments for ``create_async_engine`` on ``url``."""
+    if make_url(url).get_backend_name() != "postgresql":
+        return {"pool_pre_ping": settings.pre_ping}
+
+    return {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.timeout,
+        "pool_recycle": settings.recycle,
+        "pool_pre_ping": settings.pre_ping,
+        "connect_args": {
+            "statement_cache_size": settings.statement_cache_size,
+            "prepared_statement_cache_size": settings.prepared_statement_cache_size,
+        },
+    }
+
+
+def pool_stats(engine: Optional[AsyncEngine]) -> Optional[dict[str, Any]]:
+    if engine is None:
+        return None
+
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, InstrumentedAsyncPool):
+        stats.update(
+            checkouts=pool.checkouts,
+            waits=pool.waits,
+            wait_seconds=round(pool.wait_seconds, 6),
+            timeouts=pool.timeouts,
+        )
+    return stats
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_connection(
+    engine: AsyncEngine, *, attempts: int = 5, delay: float = 1.0
+) -> None:
+    """Run ``SELECT 1``, retrying while the database is still starting up."""
+    for attempt in range(1, attempts + 1):
+        try:
+            await _ping(engine)
+            return
+        except (OSError, exc.DBAPIError) as e:
+            if attempt == attempts:
+                raise
+            logger.warning(
+                "Database not reachable (%s), retry %d/%d", e, attempt, attempts - 1
+            )
+            await asyncio.sleep(delay)
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """Open up to ``connections`` pooled connections so requests find them ready.
+
+    Every connection is held until all of them are open, otherwise the pool
+    would hand the same one back each time.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return
+
+    barrier = asyncio.Barrier(connections)
+
+    async def hold() -> None:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await barrier.wait()
+        except asyncio.BrokenBarrierError:
+            pass
+        except BaseException:
+            await barrier.abort()
+            raise
+
+    await asyncio.gather(*(hold() for _ in range(connections)))
@@ -0,0 +1,93 @@
+"""Read replica routing for ORM sessions.
+
+``RoutingSession`` is used as the ``sync_session_class`` of the async session
+factory. It picks an engine for every statement: reads go to the replica,
+while flushes, ``INSERT``/``UPDATE``/``DELETE`` and raw SQL go to the primary.
+Once a session has written it stays on the primary, so refreshing a row that
+was just committed never hits a replica that has not caught up yet.
+
+Repository methods that read in order to write (ledger deltas, duplicate
+checks) open their session with ``info=USE_PRIMARY`` to read from the primary
+from the first statement.
+
+With ``read_your_writes`` set, every read in this process also goes to the
+primary for that many seconds after the last write, hiding replication lag
+from a client reading back what it just changed.
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Engine, TextClause, UpdateBase
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+USE_PRIMARY = {"use_primary": True}
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Engine,
+        read_your_writes: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.read_your_writes = read_your_writes
+        self.clock = clock
+        self.last_write: Optional[float] = None
+
+    def record_write(self) -> None:
+        self.last_write = self.clock()
+
+    def in_write_window(self) -> bool:
+        return (
+            self.read_your_writes > 0
+            and self.last_write is not None
+            and self.clock() - self.last_write < self.read_your_writes
+        )
+
+
+class RoutingSession(Session):
+    def __init__(self, *, router: ReplicaRouter, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["use_primary"] = True
+            self.router.record_write()
+            return self.router.primary
+
+        if (
+            self.info.get("use_primary")
+            or isinstance(clause, TextClause)
+            or self.router.in_write_window()
+        ):
+            return self.router.primary
+        return self.router.replica
+
+
+def create_session_factory(
+    primary: AsyncEngine,
+    replica: Optional[AsyncEngine] = None,
+    *,
+    read_your_writes: float = 0,
+) -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to ``primary``, routing reads to ``replica`` if set."""
+    if replica is None:
+        return async_sessionmaker(
+            bind=primary, class_=AsyncSession, autocommit=False, autoflush=False
+        )
+
+    return async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        router=ReplicaRouter(
+            primary.sync_engine, replica.sync_engine, read_your_writes
+        ),
+        autocommit=False,
+        autoflush=False,
+    )
@@ -0,0 +1,66 @@
+"""Request scoped session shared by every repository.
+
+Repositories open their session with ``async with self.session_factory()``.
+A ``UnitOfWork`` can be passed as that factory: the first call opens one
+session and every later call reuses it, so a request that goes through
+several repositories checks out a single connection and reads from a single
+transaction. Leaving the ``async with`` block does not close the session; an
+exception rolls it back, like closing it did. The owner of the unit of work
+closes it when the request is done.
+
+Read-only units of work run that transaction with ``REPEATABLE READ`` on
+PostgreSQL, so every query of the request sees the same snapshot.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class UnitOfWork:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession], read_only: bool = False
+    ):
+        self.session_factory = session_factory
+        self.read_only = read_only
+        self.session: Optional[AsyncSession] = None
+        self.closed = False
+
+    async def _open(self, info: Optional[dict[str, Any]]) -> AsyncSession:
+        if self.closed:
+            raise RuntimeError("The unit of work is already closed")
+        if self.session is not None:
+            if info:
+                self.session.info.update(info)
+            return self.session
+
+        self.session = self.session_factory(info=info)
+        if self.read_only and self.session.get_bind().dialect.name == "postgresql":
+            await self.session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+        return self.session
+
+    @asynccontextmanager
+    async def __call__(
+        self, info: Optional[dict[str, Any]] = None
+    ) -> AsyncIterator[AsyncSession]:
+        session = await self._open(info)
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+
+    async def close(self) -> None:
+        self.closed = True
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
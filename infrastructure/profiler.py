@@ -0,0 +1,194 @@
+"""Opt-in per-request SQL profiler.
+
+While a request is profiled every statement it executes is recorded with its
+duration (``infrastructure.database.instrumentation`` feeds the records, the
+parameters are never kept). When the request is done the slowest statements
+are logged and a warning is written for every statement shape that ran more
+than the N+1 threshold, the usual sign of a lazy load or a query inside a
+loop. ``ProfilerMiddleware`` also reports the totals in a ``Server-Timing``
+header, so they show up in the browser dev tools next to the request.
+
+Settings:
+    PROFILING_ENABLED               profile every request, true/false (false)
+    PROFILING_SLOW_STATEMENTS       slowest statements logged per request (3)
+    PROFILING_N_PLUS_ONE_THRESHOLD  repeats of one statement shape allowed (5)
+"""
+
+import functools
+import inspect
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?![\w.])")
+# qmark, numeric (asyncpg, with an optional cast), pyformat and named styles
+_PLACEHOLDER = re.compile(
+    r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s|%s|(?<![:\w]):\w+(?!:)|\?"
+)
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_VALUES_LIST = re.compile(r"\(\?\)(?:, \(\?\))+")
+
+
+@dataclass(frozen=True)
+class ProfilerSettings:
+    enabled: bool = False
+    slow_statements: int = 3
+    n_plus_one_threshold: int = 5
+
+    @classmethod
+    def from_env(cls) -> "ProfilerSettings":
+        return cls(
+            enabled=os.getenv("PROFILING_ENABLED", "false").lower() == "true",
+            slow_statements=int(os.getenv("PROFILING_SLOW_STATEMENTS", "3")),
+            n_plus_one_threshold=int(os.getenv("PROFILING_N_PLUS_ONE_THRESHOLD", "5")),
+        )
+
+
+@dataclass
+class StatementRecord:
+    statement: str
+    seconds: float
+    executemany: bool = False
+
+
+@dataclass
+class RequestProfile:
+    statements: list[StatementRecord] = field(default_factory=list)
+    # set by ProfiledRoute when the endpoint returns, serialization follows
+    endpoint_finished: Optional[float] = None
+
+    @property
+    def db_seconds(self) -> float:
+        return sum(record.seconds for record in self.statements)
+
+    def slowest(self, limit: int) -> list[StatementRecord]:
+        return sorted(self.statements, key=lambda record: record.seconds, reverse=True)[
+            :limit
+        ]
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times."""
+        counts = Counter(
+            statement_shape(record.statement) for record in self.statements
+        )
+        return [
+            (shape, count) for shape, count in counts.most_common() if count > threshold
+        ]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_request() -> Iterator[RequestProfile]:
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def statement_shape(statement: str) -> str:
+    """``statement`` with literals and placeholders replaced by ``?``.
+
+    Lists of placeholders collapse into one, so ``IN (?, ?)`` and ``IN (?)``
+    and multi row ``VALUES`` have the same shape whatever their length. The
+    shape never contains parameter values, so it is also what gets logged.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _VALUES_LIST.sub("(?)", shape)
+
+
+def server_timing(profile: RequestProfile, now: Optional[float] = None) -> str:
+    """``Server-Timing`` value with the statements recorded so far."""
+    metrics = [
+        f"db;dur={profile.db_seconds * 1000:.3f}",
+        f'db-queries;desc="{len(profile.statements)}"',
+    ]
+    if profile.endpoint_finished is not None:
+        serialize = (now or time.perf_counter()) - profile.endpoint_finished
+        metrics.append(f"serialize;dur={serialize * 1000:.3f}")
+    return ", ".join(metrics)
+
+
+def log_profile(
+    profile: RequestProfile, request: str, settings: ProfilerSettings
+) -> None:
+    logger.info(
+        "%s: %d statements in %.2fms",
+        request,
+        len(profile.statements),
+        profile.db_seconds * 1000,
+    )
+    for record in profile.slowest(settings.slow_statements):
+        logger.info(
+            "%s: %.2fms %s",
+            request,
+            record.seconds * 1000,
+            statement_shape(record.statement),
+        )
+    for shape, count in profile.repeated_shapes(settings.n_plus_one_threshold):
+        logger.warning(
+            "%s: possible N+1, statement ran %d times: %s", request, count, shape
+        )
+
+
+class ProfiledRoute(APIRoute):
+    """Route that notes when its endpoint returns on the request profile.
+
+    FastAPI validates and serializes the return value after that, so the time
+    until the response starts is the serialization time. Responses rendered
+    inside the endpoint mark it themselves, see ``mark_endpoint_finished``.
+    Generator endpoints are left alone, their body is produced while streaming.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _mark_finished(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def mark_endpoint_finished() -> None:
+    """Note that the endpoint is done and serialization starts, once per request.
+
+    Responses that render their body while the endpoint builds them, such as
+    ``FastJSONResponse``, call this before encoding so the encoding still
+    counts as serialization.
+    """
+    profile = _current_profile.get()
+    if profile is not None and profile.endpoint_finished is None:
+        profile.endpoint_finished = time.perf_counter()
+
+
+def _mark_finished(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            mark_endpoint_finished()
+
+    return wrapper
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Mapping, Optional
+from typing import Any, Collection, Mapping, Optional
 from domain.models.student import Student
-from domain.models.school import School
+from domain.models.school import School, SchoolDebt
 from domain.models.invoice import Invoice, Payment
 
 
@@ -41,4 +41,35 @@ class BaseRepository(ABC):
         self,
         *,
         student_id: Optional[int] = None,
-    ) -> list[Payment]: ...
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[Payment], int]: ...
+
+    @abstractmethod
+    async def get_financial_status(self, student_id: int) -> Optional[Student]: ...
+
+    @abstractmethod
+    async def get_financial_statuses(
+        self,
+        student_ids: Collection[int],
+        *,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[Student], int]: ...
+
+    @abstractmethod
+    async def get_school_debt(self, school_id: int) -> Optional[School]: ...
+
+    @abstractmethod
+    async def get_school_students_version(
+        self, school_id: int, *, status: str
+    ) -> Optional[tuple[int, ...]]: ...
+
+    @abstractmethod
+    async def get_schools_debt(
+        self,
+        *,
+        sort: str = "-total_debt",
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[SchoolDebt], int]: ...
@@ -0,0 +1,159 @@
+"""Bounded in-process cache for hot single-entity reads.
+
+Students, schools, financial statuses and school debts are read far more
+often than they change. The repositories keep them in ``cache``, a process
+wide LRU with a time to live per namespace, and drop the affected keys after
+every write they commit. Writes made by other processes (another API worker,
+the CLI tools) are only seen once the entry expires, so TTLs stay short for
+the balance namespaces.
+
+A read that queried the database before a write committed must not cache
+what it read after the write invalidated the key. Readers take a
+``generation()`` before their query and pass it to ``set``, which drops the
+value when the key was invalidated in between.
+
+Settings:
+    CACHE_MAX_ENTRIES           entries kept before evicting the least used
+    CACHE_TTL_<NAMESPACE>       seconds, e.g. CACHE_TTL_SCHOOL_DEBT; 0 disables
+"""
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable, Mapping, Optional
+
+STUDENT = "student"
+SCHOOL = "school"
+FINANCIAL_STATUS = "financial_status"
+SCHOOL_DEBT = "school_debt"
+
+DEFAULT_TTLS = {
+    STUDENT: 300.0,
+    SCHOOL: 300.0,
+    FINANCIAL_STATUS: 30.0,
+    SCHOOL_DEBT: 30.0,
+}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache:
+    """LRU mapping of ``(namespace, key)`` to values with per-namespace TTLs.
+
+    Values are expected to be pydantic models; a copy is returned on every
+    hit so callers can not modify the cached instance.
+
+    Every invalidation is stamped with an increasing generation. At most
+    ``max_entries`` stamps are kept; when the oldest is dropped, reads that
+    started before it are not cached at all.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttls: Mapping[str, float],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttls = dict(ttls)
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self._generation = 0
+        # generation of the last invalidation per key, oldest first
+        self._invalidated: OrderedDict[tuple[str, Hashable], int] = OrderedDict()
+        # reads older than this may have missed a dropped invalidation stamp
+        self._oldest_generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[(namespace, key)]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end((namespace, key))
+        self.stats.hits += 1
+        return value.model_copy()
+
+    def generation(self) -> int:
+        """Token for ``set``, taken before reading the value from the database."""
+        return self._generation
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        ttl = self.ttls.get(namespace, 0)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and (
+            generation < self._oldest_generation
+            or self._invalidated.get((namespace, key), 0) > generation
+        ):
+            # invalidated while the value was being read, it may be stale
+            return
+
+        self._entries[(namespace, key)] = (self.clock() + ttl, value.model_copy())
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, namespace: str, *keys: Hashable) -> None:
+        for key in keys:
+            self._generation += 1
+            self._invalidated[(namespace, key)] = self._generation
+            self._invalidated.move_to_end((namespace, key))
+            if self._entries.pop((namespace, key), None) is not None:
+                self.stats.invalidations += 1
+        while len(self._invalidated) > max(self.max_entries, 1):
+            _, dropped = self._invalidated.popitem(last=False)
+            self._oldest_generation = dropped
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._invalidated.clear()
+        self._oldest_generation = self._generation
+        self.stats = CacheStats()
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            "hit_ratio": self.stats.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttls": self.ttls,
+        }
+
+
+cache = TTLCache(
+    max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+    ttls={
+        namespace: float(os.getenv(f"CACHE_TTL_{namespace.upper()}", ttl))
+        for namespace, ttl in DEFAULT_TTLS.items()
+    },
+)
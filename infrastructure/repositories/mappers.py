@@ -0,0 +1,71 @@
+"""Mapping from ORM rows to domain models.
+
+Rows read back from our own tables already satisfied the domain validation
+when they were written (``EmailStr``, ``Student.validate_age``, enum values),
+so they are built with ``model_construct`` which skips pydantic validation.
+Data coming from API clients must keep going through the validating
+constructors.
+"""
+
+from typing import Collection
+
+from domain.models.invoice import Invoice, Payment
+from domain.models.school import School
+from domain.models.student import Student
+from infrastructure.database.orm import (
+    InvoiceTable,
+    PaymentTable,
+    SchoolTable,
+    StudentTable,
+)
+
+
+def to_student(student: StudentTable) -> Student:
+    return Student.model_construct(
+        id=student.id,
+        first_name=student.first_name,
+        last_name=student.last_name,
+        email=student.email,
+        age=student.age,
+        created_at=student.created_at,
+    )
+
+
+def to_school(school: SchoolTable) -> School:
+    return School.model_construct(
+        id=school.id,
+        ref=school.ref,
+        name=school.name,
+        created_at=school.created_at,
+    )
+
+
+def to_invoice(invoice: InvoiceTable, expand: Collection[str] = ()) -> Invoice:
+    """Map an invoice, nesting the student and school only when expanded.
+
+    Relationships that are not expanded are never loaded, so only the foreign
+    key columns are read for them.
+    """
+    return Invoice.model_construct(
+        id=invoice.id,
+        ref=invoice.ref,
+        value=invoice.value,
+        date=invoice.date,
+        status=invoice.status,
+        created_at=invoice.created_at,
+        student=(
+            to_student(invoice.student) if "student" in expand else invoice.student_id
+        ),
+        school=to_school(invoice.school) if "school" in expand else invoice.school_id,
+    )
+
+
+def to_payment(payment: PaymentTable, expand: Collection[str] = ()) -> Payment:
+    return Payment.model_construct(
+        id=payment.id,
+        ref=payment.ref,
+        value=payment.value,
+        date=payment.date,
+        created_at=payment.created_at,
+        invoice=to_invoice(payment.invoice, expand),
+    )
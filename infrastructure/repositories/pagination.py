@@ -0,0 +1,112 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select, bindparam, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a keyset cursor can not be decoded."""
+
+
+async def count_rows(session: AsyncSession, stmt: Select) -> int:
+    """Count the rows matched by a statement without loading them.
+
+    Ordering is irrelevant for a count, so it is dropped before wrapping the
+    statement in a ``SELECT count(*)`` subquery. Eager loading options only
+    apply to top level ORM entities and are ignored inside the subquery.
+    """
+    subquery = stmt.order_by(None).subquery()
+    result = await session.execute(select(func.count()).select_from(subquery))
+    return result.scalar_one()
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    *,
+    offset: int = 0,
+    limit: int = 10,
+) -> tuple[list[Any], int]:
+    """Return one page of ORM objects for ``stmt`` and the total row count."""
+    total = await count_rows(session, stmt)
+    if total == 0 or offset >= total:
+        return [], total
+
+    result = await session.execute(stmt.offset(offset).limit(limit))
+    return list(result.scalars().all()), total
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Build an opaque cursor from the sort key values of the last row."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Decode a cursor back into values typed after the sort ``columns``."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {token}") from e
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursorError(f"Invalid cursor: {token}")
+
+    values = []
+    for value, column in zip(payload, columns):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(python_type(value))
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {token}") from e
+    return values
+
+
+async def seek(
+    session: AsyncSession,
+    stmt: Select,
+    *,
+    columns: Sequence[InstrumentedAttribute],
+    after: Optional[str] = None,
+    limit: int = 10,
+) -> tuple[list[Any], Optional[str]]:
+    """Return the rows that follow ``after`` in ``columns`` order.
+
+    Instead of skipping rows with ``OFFSET`` the statement filters with a row
+    value comparison, ``(a, b) > (:a, :b)``, which an index on ``columns`` can
+    answer directly, so every page costs the same no matter how deep it is.
+    One extra row is fetched to know whether there is a next page.
+    """
+    if after is not None:
+        values = decode_cursor(after, columns)
+        stmt = stmt.where(
+            tuple_(*columns)
+            > tuple_(
+                *(
+                    bindparam(None, value, type_=column.type)
+                    for value, column in zip(values, columns)
+                )
+            )
+        )
+
+    stmt = stmt.order_by(None).order_by(*columns).limit(limit + 1)
+    result = await session.execute(stmt)
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in columns])
+    return rows, next_cursor
@@ -1,21 +1,41 @@
 import logging
-from typing import Any, Mapping, Optional
+from typing import Any, AsyncIterator, Collection, Mapping, Optional, Sequence
 from datetime import datetime
+from decimal import Decimal
 
-from sqlalchemy import select, delete as sql_delete
+from sqlalchemy import Select, and_, func, insert, select, delete as sql_delete
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from domain.models.student import Student
-from domain.models.school import School
-from domain.models.invoice import Invoice, Payment
+from domain.models.school import School, SchoolDebt
+from domain.models.invoice import BulkRowError, Invoice, InvoiceStatus, Payment
 from infrastructure.database.orm import (
+    INVOICE_IS_PENDING,
     StudentTable,
     SchoolTable,
     InvoiceTable,
     PaymentTable,
     SchoolStudentsTable,
+    StudentBalanceTable,
+    SchoolBalanceTable,
 )
+from infrastructure.database.balances import BalanceDelta, apply_balance_deltas
+from infrastructure.database.routing import USE_PRIMARY
+from infrastructure.repositories.cache import (
+    FINANCIAL_STATUS,
+    SCHOOL,
+    SCHOOL_DEBT,
+    STUDENT,
+    cache,
+)
+from infrastructure.repositories.mappers import (
+    to_invoice,
+    to_payment,
+    to_school,
+    to_student,
+)
+from infrastructure.repositories.pagination import count_rows, paginate, seek
 
 
 logger = logging.getLogger(__name__)
@@ -34,10 +54,61 @@ def _filter_by_attributes(stmt, filters, table):
     return stmt
 
 
+async def _commit_with_balances(
+    session: AsyncSession, deltas: Sequence[BalanceDelta]
+) -> None:
+    """Apply ``deltas``, commit and drop the cached balances they touch.
+
+    The cache is invalidated after the commit. A read that ran its query
+    before the commit still holds the old balance; its ``cache.set`` is
+    dropped because the generation it took is older than the invalidation.
+    """
+    await apply_balance_deltas(session, deltas)
+    await session.commit()
+    cache.invalidate(FINANCIAL_STATUS, *{delta.student_id for delta in deltas})
+    cache.invalidate(SCHOOL_DEBT, *{delta.school_id for delta in deltas})
+
+
+def _expand_options(expand: Collection[str], path=None) -> list:
+    """Loader options for the expanded invoice relationships."""
+    options = []
+    for name, relationship in (
+        ("student", InvoiceTable.student),
+        ("school", InvoiceTable.school),
+    ):
+        if name in expand:
+            options.append(
+                path.selectinload(relationship) if path else selectinload(relationship)
+            )
+    return options
+
+
 class StudentRepository:
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
         self.session_factory = session_factory
 
+    def _students_query(
+        self,
+        *,
+        filters: Optional[Mapping[str, Any]] = None,
+        school_id: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> Select:
+        stmt = select(StudentTable)
+
+        if school_id or status:
+            stmt = stmt.join(
+                SchoolStudentsTable,
+                StudentTable.id == SchoolStudentsTable.student_id,
+            )
+
+            if school_id:
+                stmt = stmt.where(SchoolStudentsTable.school_id == school_id)
+            if status:
+                stmt = stmt.where(SchoolStudentsTable.status == status)
+
+        return _filter_by_attributes(stmt, filters, StudentTable)
+
     async def get_students(
         self,
         *,
@@ -48,41 +119,114 @@ class StudentRepository:
         limit: int = 10,
     ) -> tuple[list[Student], int]:
         async with self.session_factory() as session:
-            stmt = select(StudentTable)
+            stmt = self._students_query(
+                filters=filters, school_id=school_id, status=status
+            )
+            stmt = stmt.order_by(StudentTable.id)
 
-            if school_id or status:
-                stmt = stmt.join(
-                    SchoolStudentsTable,
-                    StudentTable.id == SchoolStudentsTable.student_id,
-                )
+            students, total = await paginate(session, stmt, offset=offset, limit=limit)
+            return [to_student(student) for student in students], total
+
+    async def get_students_keyset(
+        self,
+        *,
+        filters: Optional[Mapping[str, Any]] = None,
+        school_id: Optional[int] = None,
+        status: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 10,
+    ) -> tuple[list[Student], Optional[str]]:
+        async with self.session_factory() as session:
+            stmt = self._students_query(
+                filters=filters, school_id=school_id, status=status
+            )
 
-                if school_id:
-                    stmt = stmt.where(SchoolStudentsTable.school_id == school_id)
-                if status:
-                    stmt = stmt.where(SchoolStudentsTable.status == status)
+            students, next_cursor = await seek(
+                session, stmt, columns=[StudentTable.id], after=after, limit=limit
+            )
+            return [to_student(student) for student in students], next_cursor
+
+    @staticmethod
+    def _financial_status_query() -> Select:
+        return select(
+            StudentTable,
+            func.coalesce(StudentBalanceTable.total_paid, 0).label("total_paid"),
+            func.coalesce(StudentBalanceTable.total_debt, 0).label("total_debt"),
+        ).outerjoin(
+            StudentBalanceTable,
+            StudentBalanceTable.student_id == StudentTable.id,
+        )
+
+    @staticmethod
+    def _with_totals(row) -> Student:
+        student = to_student(row.StudentTable)
+        student.total_paid = Decimal(row.total_paid)
+        student.total_debt = Decimal(row.total_debt)
+        return student
+
+    async def get_student(self, student_id: int) -> Optional[Student]:
+        """Return one student by id, served from the cache when possible."""
+        student = cache.get(STUDENT, student_id)
+        if student is not None:
+            return student
+
+        generation = cache.generation()
+        async with self.session_factory() as session:
+            student_table = await session.get(StudentTable, student_id)
+            if student_table is None:
+                return None
+
+            student = to_student(student_table)
+            cache.set(STUDENT, student_id, student, generation)
+            return student
+
+    async def get_financial_status(self, student_id: int) -> Optional[Student]:
+        """Return the student with ``total_paid`` and ``total_debt`` filled in.
+
+        Totals are read from the ``student_balances`` ledger, a primary key
+        lookup whose cost does not depend on the number of invoices, and
+        cached until a write touches the student's balance.
+        """
+        student = cache.get(FINANCIAL_STATUS, student_id)
+        if student is not None:
+            return student
+
+        generation = cache.generation()
+        async with self.session_factory() as session:
+            stmt = self._financial_status_query().where(StudentTable.id == student_id)
+            result = await session.execute(stmt)
+            row = result.one_or_none()
+            if row is None:
+                return None
 
-            stmt = _filter_by_attributes(stmt, filters, StudentTable)
-            stmt = stmt.order_by(StudentTable.id)
+            student = self._with_totals(row)
+            cache.set(FINANCIAL_STATUS, student_id, student, generation)
+            return student
 
-            # Get total count before pagination
-            count_result = await session.execute(stmt)
-            total = len(count_result.scalars().all())
+    async def get_financial_statuses(
+        self,
+        student_ids: Collection[int],
+        *,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[Student], int]:
+        """Financial status of many students at once, ordered by id.
 
-            paginated_stmt = stmt.offset(offset).limit(limit)
-            result = await session.execute(paginated_stmt)
-            students = result.scalars().all()
+        One ``WHERE id IN (...)`` query over the ledger serves the whole page.
+        Unknown ids are left out, ``total`` counts the students found.
+        """
+        async with self.session_factory() as session:
+            stmt = self._financial_status_query().where(
+                StudentTable.id.in_(set(student_ids))
+            )
+            total = await count_rows(session, stmt)
+            if total == 0 or offset >= total:
+                return [], total
 
-            return [
-                Student(
-                    id=student.id,
-                    first_name=student.first_name,
-                    last_name=student.last_name,
-                    email=student.email,
-                    age=student.age,
-                    created_at=student.created_at,
-                )
-                for student in students
-            ], total
+            result = await session.execute(
+                stmt.order_by(StudentTable.id).offset(offset).limit(limit)
+            )
+            return [self._with_totals(row) for row in result], total
 
     async def create_student(
         self,
@@ -92,7 +236,7 @@ class StudentRepository:
         email: str,
         age: int,
     ) -> Student:
-        async with self.session_factory() as session:
+        async with self.session_factory(info=USE_PRIMARY) as session:
             student_table = StudentTable(
                 first_name=first_name,
                 last_name=last_name,
@@ -101,23 +245,25 @@ class StudentRepository:
                 created_at=datetime.now(),
             )
             session.add(student_table)
-            await session.commit()
+            await session.flush()
             await session.refresh(student_table)
+            student = to_student(student_table)
+            await session.commit()
 
-            return Student(
-                id=student_table.id,
-                first_name=student_table.first_name,
-                last_name=student_table.last_name,
-                email=student_table.email,
-                age=student_table.age,
-                created_at=student_table.created_at,
-            )
+            return student
 
     async def delete_student(self, student_id: int) -> bool:
-        async with self.session_factory() as session:
+        async with self.session_factory(info=USE_PRIMARY) as session:
+            await session.execute(
+                sql_delete(StudentBalanceTable).where(
+                    StudentBalanceTable.student_id == student_id
+                )
+            )
             stmt = sql_delete(StudentTable).where(StudentTable.id == student_id)
             result = await session.execute(stmt)
             await session.commit()
+            cache.invalidate(STUDENT, student_id)
+            cache.invalidate(FINANCIAL_STATUS, student_id)
             return result.rowcount > 0
 
 
@@ -137,22 +283,176 @@ class SchoolRepository:
             stmt = _filter_by_attributes(stmt, filters, SchoolTable)
             stmt = stmt.order_by(SchoolTable.id)
 
-            # Get total count before pagination
-            count_result = await session.execute(stmt)
-            total = len(count_result.scalars().all())
+            schools, total = await paginate(session, stmt, offset=offset, limit=limit)
+            return [to_school(school) for school in schools], total
+
+    async def get_schools_keyset(
+        self,
+        *,
+        filters: Optional[Mapping[str, Any]] = None,
+        after: Optional[str] = None,
+        limit: int = 10,
+    ) -> tuple[list[School], Optional[str]]:
+        async with self.session_factory() as session:
+            stmt = select(SchoolTable)
+            stmt = _filter_by_attributes(stmt, filters, SchoolTable)
+
+            schools, next_cursor = await seek(
+                session, stmt, columns=[SchoolTable.id], after=after, limit=limit
+            )
+            return [to_school(school) for school in schools], next_cursor
+
+    async def get_school(self, school_id: int) -> Optional[School]:
+        """Return one school by id, served from the cache when possible."""
+        school = cache.get(SCHOOL, school_id)
+        if school is not None:
+            return school
 
-            paginated_stmt = stmt.offset(offset).limit(limit)
-            result = await session.execute(paginated_stmt)
-            schools = result.scalars().all()
+        generation = cache.generation()
+        async with self.session_factory() as session:
+            school_table = await session.get(SchoolTable, school_id)
+            if school_table is None:
+                return None
+
+            school = to_school(school_table)
+            cache.set(SCHOOL, school_id, school, generation)
+            return school
+
+    async def get_school_students_version(
+        self, school_id: int, *, status: str
+    ) -> Optional[tuple[int, ...]]:
+        """Version of the students of a school, ``None`` if it does not exist.
+
+        Students and enrollments are only ever added or removed, never
+        updated, so the number of enrolled students, the sum of their ids and
+        the newest enrollment id change whenever the list does. One aggregate
+        over the ``school_students`` index instead of the school, count and
+        page queries of the list itself.
+        """
+        async with self.session_factory() as session:
+            stmt = (
+                select(
+                    func.count(StudentTable.id),
+                    func.coalesce(func.sum(StudentTable.id), 0),
+                    func.coalesce(func.max(SchoolStudentsTable.id), 0),
+                )
+                .select_from(SchoolTable)
+                .outerjoin(
+                    SchoolStudentsTable,
+                    and_(
+                        SchoolStudentsTable.school_id == SchoolTable.id,
+                        SchoolStudentsTable.status == status,
+                    ),
+                )
+                .outerjoin(
+                    StudentTable, StudentTable.id == SchoolStudentsTable.student_id
+                )
+                .where(SchoolTable.id == school_id)
+                .group_by(SchoolTable.id)
+            )
+            row = (await session.execute(stmt)).one_or_none()
+            return tuple(row) if row is not None else None
 
+    async def get_school_debt(self, school_id: int) -> Optional[School]:
+        """Return the school with ``total_debt`` read from ``school_balances``.
+
+        The result is cached until a write touches the school's balance.
+        """
+        school = cache.get(SCHOOL_DEBT, school_id)
+        if school is not None:
+            return school
+
+        generation = cache.generation()
+        async with self.session_factory() as session:
+            stmt = (
+                select(
+                    SchoolTable,
+                    func.coalesce(SchoolBalanceTable.total_debt, 0).label("total_debt"),
+                )
+                .outerjoin(
+                    SchoolBalanceTable, SchoolBalanceTable.school_id == SchoolTable.id
+                )
+                .where(SchoolTable.id == school_id)
+            )
+            result = await session.execute(stmt)
+            row = result.one_or_none()
+            if row is None:
+                return None
+
+            school = to_school(row.SchoolTable)
+            school.total_debt = Decimal(row.total_debt)
+            cache.set(SCHOOL_DEBT, school_id, school, generation)
+            return school
+
+    async def get_schools_debt(
+        self,
+        *,
+        sort: str = "-total_debt",
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[SchoolDebt], int]:
+        """Pending debt of every school from one ``GROUP BY`` over invoices.
+
+        Pending invoices are aggregated per school (served by the partial
+        ``ix_invoices_pending_school`` index) and outer joined to schools, so
+        schools without debt are listed with zero totals. ``sort`` is one of
+        ``SCHOOL_DEBT_SORTABLE``, optionally prefixed with ``-``; ties are
+        broken by id.
+        """
+        pending = (
+            select(
+                InvoiceTable.school_id,
+                func.sum(InvoiceTable.value).label("total_debt"),
+                func.count().label("pending_invoices"),
+                func.min(InvoiceTable.date).label("oldest_pending_date"),
+            )
+            .where(INVOICE_IS_PENDING)
+            .group_by(InvoiceTable.school_id)
+            .subquery()
+        )
+        columns = {
+            "id": SchoolTable.id,
+            "name": SchoolTable.name,
+            "total_debt": func.coalesce(pending.c.total_debt, 0),
+            "pending_invoices": func.coalesce(pending.c.pending_invoices, 0),
+            "oldest_pending_date": pending.c.oldest_pending_date,
+        }
+        descending = sort.startswith("-")
+        column = columns[sort.lstrip("-")]
+        order = column.desc().nulls_last() if descending else column.nulls_last()
+
+        async with self.session_factory() as session:
+            total = (
+                await session.execute(select(func.count()).select_from(SchoolTable))
+            ).scalar_one()
+            if total == 0 or offset >= total:
+                return [], total
+
+            stmt = (
+                select(
+                    SchoolTable.id,
+                    SchoolTable.ref,
+                    SchoolTable.name,
+                    columns["total_debt"].label("total_debt"),
+                    columns["pending_invoices"].label("pending_invoices"),
+                    pending.c.oldest_pending_date,
+                )
+                .outerjoin(pending, pending.c.school_id == SchoolTable.id)
+                .order_by(order, SchoolTable.id)
+                .offset(offset)
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
             return [
-                School(
-                    id=school.id,
-                    ref=school.ref,
-                    name=school.name,
-                    created_at=school.created_at,
+                SchoolDebt.model_construct(
+                    id=row.id,
+                    ref=row.ref,
+                    name=row.name,
+                    total_debt=Decimal(row.total_debt),
+                    pending_invoices=row.pending_invoices,
+                    oldest_pending_date=row.oldest_pending_date,
                 )
-                for school in schools
+                for row in result
             ], total
 
     async def create_school(
@@ -161,24 +461,28 @@ class SchoolRepository:
         ref: str,
         name: str,
     ) -> School:
-        async with self.session_factory() as session:
+        async with self.session_factory(info=USE_PRIMARY) as session:
             school_table = SchoolTable(ref=ref, name=name, created_at=datetime.now())
             session.add(school_table)
-            await session.commit()
+            await session.flush()
             await session.refresh(school_table)
+            school = to_school(school_table)
+            await session.commit()
 
-            return School(
-                id=school_table.id,
-                ref=school_table.ref,
-                name=school_table.name,
-                created_at=school_table.created_at,
-            )
+            return school
 
     async def delete_school(self, school_id: int) -> bool:
-        async with self.session_factory() as session:
+        async with self.session_factory(info=USE_PRIMARY) as session:
+            await session.execute(
+                sql_delete(SchoolBalanceTable).where(
+                    SchoolBalanceTable.school_id == school_id
+                )
+            )
             stmt = sql_delete(SchoolTable).where(SchoolTable.id == school_id)
             result = await session.execute(stmt)
             await session.commit()
+            cache.invalidate(SCHOOL, school_id)
+            cache.invalidate(SCHOOL_DEBT, school_id)
             return result.rowcount > 0
 
 
@@ -186,6 +490,21 @@ class InvoiceRepository:
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
         self.session_factory = session_factory
 
+    def _invoices_query(
+        self,
+        *,
+        school_id: Optional[int] = None,
+        student_id: Optional[int] = None,
+        expand: Collection[str] = (),
+    ) -> Select:
+        stmt = select(InvoiceTable).options(*_expand_options(expand))
+
+        if school_id:
+            stmt = stmt.where(InvoiceTable.school_id == school_id)
+        if student_id:
+            stmt = stmt.where(InvoiceTable.student_id == student_id)
+        return stmt
+
     async def get_invoices(
         self,
         *,
@@ -193,52 +512,39 @@ class InvoiceRepository:
         student_id: Optional[int] = None,
         offset: int = 0,
         limit: int = 10,
+        expand: Collection[str] = (),
     ) -> tuple[list[Invoice], int]:
         async with self.session_factory() as session:
-            stmt = select(InvoiceTable).options(
-                selectinload(InvoiceTable.student), selectinload(InvoiceTable.school)
+            stmt = self._invoices_query(
+                school_id=school_id, student_id=student_id, expand=expand
             )
+            stmt = stmt.order_by(InvoiceTable.created_at, InvoiceTable.id)
 
-            if school_id:
-                stmt = stmt.where(InvoiceTable.school_id == school_id)
-            if student_id:
-                stmt = stmt.where(InvoiceTable.student_id == student_id)
-
-            stmt = stmt.order_by(InvoiceTable.created_at)
+            invoices, total = await paginate(session, stmt, offset=offset, limit=limit)
+            return [to_invoice(invoice, expand) for invoice in invoices], total
 
-            # Get total count before pagination
-            count_result = await session.execute(stmt)
-            total = len(count_result.scalars().all())
-
-            paginated_stmt = stmt.offset(offset).limit(limit)
-            result = await session.execute(paginated_stmt)
-            invoices = result.scalars().all()
+    async def get_invoices_keyset(
+        self,
+        *,
+        school_id: Optional[int] = None,
+        student_id: Optional[int] = None,
+        after: Optional[str] = None,
+        limit: int = 10,
+        expand: Collection[str] = (),
+    ) -> tuple[list[Invoice], Optional[str]]:
+        async with self.session_factory() as session:
+            stmt = self._invoices_query(
+                school_id=school_id, student_id=student_id, expand=expand
+            )
 
-            return [
-                Invoice(
-                    id=invoice.id,
-                    ref=invoice.ref,
-                    value=invoice.value,
-                    date=invoice.date,
-                    status=invoice.status,
-                    created_at=invoice.created_at,
-                    student=Student(
-                        id=invoice.student.id,
-                        first_name=invoice.student.first_name,
-                        last_name=invoice.student.last_name,
-                        email=invoice.student.email,
-                        age=invoice.student.age,
-                        created_at=invoice.student.created_at,
-                    ),
-                    school=School(
-                        id=invoice.school.id,
-                        ref=invoice.school.ref,
-                        name=invoice.school.name,
-                        created_at=invoice.school.created_at,
-                    ),
-                )
-                for invoice in invoices
-            ], total
+            invoices, next_cursor = await seek(
+                session,
+                stmt,
+                columns=[InvoiceTable.created_at, InvoiceTable.id],
+                after=after,
+                limit=limit,
+            )
+            return [to_invoice(invoice, expand) for invoice in invoices], next_cursor
 
     async def create_invoice(
         self,
@@ -250,7 +556,7 @@ class InvoiceRepository:
         date: datetime,
         status: str,
     ) -> Invoice:
-        async with self.session_factory() as session:
+        async with self.session_factory(info=USE_PRIMARY) as session:
             invoice_table = InvoiceTable(
                 ref=ref,
                 student_id=student_id,
@@ -261,101 +567,215 @@ class InvoiceRepository:
                 created_at=datetime.now(),
             )
             session.add(invoice_table)
-            await session.commit()
+            deltas = []
+            if InvoiceStatus(status) == InvoiceStatus.PENDING:
+                deltas.append(
+                    BalanceDelta(
+                        student_id=student_id,
+                        school_id=school_id,
+                        debt=Decimal(value),
+                    )
+                )
+            await session.flush()
             await session.refresh(invoice_table)
+            invoice = to_invoice(invoice_table)
+            await _commit_with_balances(session, deltas)
+
+            return invoice
+
+    async def create_invoices_bulk(
+        self, invoices: Sequence[Mapping[str, Any]]
+    ) -> tuple[list[Invoice], list[BulkRowError]]:
+        """Insert many invoices with batched multi-row ``INSERT ... RETURNING``.
+
+        Students, schools and duplicate refs are checked for the whole batch
+        with one query each. Rows that fail a check are reported back by
+        position and skipped, the rest are inserted in a single transaction
+        together with their balance deltas.
+
+        SQLAlchemy splits the rows into multi-row INSERTs of up to
+        ``insertmanyvalues_page_size`` (1000) rows, or fewer where the
+        driver's bound parameter limit is lower. The returned rows come back
+        in no guaranteed order and are matched to the request by ``ref``,
+        which is unique.
+        """
+        errors: list[BulkRowError] = []
+        async with self.session_factory(info=USE_PRIMARY) as session:
+            student_ids = {row["student_id"] for row in invoices}
+            school_ids = {row["school_id"] for row in invoices}
+            refs = [row["ref"] for row in invoices]
+
+            known_students = set(
+                await session.scalars(
+                    select(StudentTable.id).where(StudentTable.id.in_(student_ids))
+                )
+            )
+            known_schools = set(
+                await session.scalars(
+                    select(SchoolTable.id).where(SchoolTable.id.in_(school_ids))
+                )
+            )
+            taken_refs = set(
+                await session.scalars(
+                    select(InvoiceTable.ref).where(InvoiceTable.ref.in_(refs))
+                )
+            )
 
-            stmt = (
-                select(InvoiceTable)
-                .options(
-                    selectinload(InvoiceTable.student),
-                    selectinload(InvoiceTable.school),
+            values = []
+            for index, row in enumerate(invoices):
+                detail = None
+                if row["student_id"] not in known_students:
+                    detail = f"Student {row['student_id']} not found"
+                elif row["school_id"] not in known_schools:
+                    detail = f"School {row['school_id']} not found"
+                elif row["ref"] in taken_refs:
+                    detail = f"Invoice ref {row['ref']} already exists"
+                elif row["status"] not in InvoiceStatus.__members__:
+                    detail = f"Invalid status {row['status']}"
+
+                if detail:
+                    errors.append(
+                        BulkRowError(index=index, ref=row["ref"], detail=detail)
+                    )
+                    continue
+
+                taken_refs.add(row["ref"])
+                values.append(
+                    {
+                        "ref": row["ref"],
+                        "student_id": row["student_id"],
+                        "school_id": row["school_id"],
+                        "value": Decimal(row["value"]),
+                        "date": row["date"],
+                        "status": InvoiceStatus(row["status"]),
+                        "created_at": datetime.now(),
+                    }
                 )
-                .where(InvoiceTable.id == invoice_table.id)
+
+            if not values:
+                return [], errors
+
+            # Unordered RETURNING keeps the insert batched on every dialect,
+            # sort_by_parameter_order needs a sentinel column that SQLite
+            # lacks and falls back to one INSERT per row there.
+            result = await session.scalars(
+                insert(InvoiceTable).returning(InvoiceTable), values
             )
-            result = await session.execute(stmt)
-            invoice = result.scalar_one()
-
-            return Invoice(
-                id=invoice.id,
-                ref=invoice.ref,
-                value=invoice.value,
-                date=invoice.date,
-                status=invoice.status,
-                created_at=invoice.created_at,
-                student=Student(
-                    id=invoice.student.id,
-                    first_name=invoice.student.first_name,
-                    last_name=invoice.student.last_name,
-                    email=invoice.student.email,
-                    age=invoice.student.age,
-                    created_at=invoice.student.created_at,
-                ),
-                school=School(
-                    id=invoice.school.id,
-                    ref=invoice.school.ref,
-                    name=invoice.school.name,
-                    created_at=invoice.school.created_at,
-                ),
+            by_ref = {invoice.ref: invoice for invoice in result.all()}
+            created = [to_invoice(by_ref[row["ref"]]) for row in values]
+            await _commit_with_balances(
+                session,
+                [
+                    BalanceDelta(
+                        student_id=row["student_id"],
+                        school_id=row["school_id"],
+                        debt=row["value"],
+                    )
+                    for row in values
+                    if row["status"] == InvoiceStatus.PENDING
+                ],
             )
+            return created, errors
 
     async def delete_invoice(self, invoice_id: int) -> bool:
-        async with self.session_factory() as session:
-            stmt = sql_delete(InvoiceTable).where(InvoiceTable.id == invoice_id)
+        """Delete an invoice together with its payments.
+
+        ``payments.invoice_id`` does not cascade, the payments are deleted in
+        the same transaction and their total taken off the ledger.
+        """
+        async with self.session_factory(info=USE_PRIMARY) as session:
+            payments = await session.execute(
+                sql_delete(PaymentTable)
+                .where(PaymentTable.invoice_id == invoice_id)
+                .returning(PaymentTable.value)
+            )
+            paid = sum(payments.scalars(), Decimal(0))
+
+            stmt = (
+                sql_delete(InvoiceTable)
+                .where(InvoiceTable.id == invoice_id)
+                .returning(
+                    InvoiceTable.student_id,
+                    InvoiceTable.school_id,
+                    InvoiceTable.value,
+                    InvoiceTable.status,
+                )
+            )
             result = await session.execute(stmt)
-            await session.commit()
-            return result.rowcount > 0
+            deleted = result.one_or_none()
+            if deleted is None:
+                return False
+
+            debt = deleted.value if deleted.status == InvoiceStatus.PENDING else 0
+            await _commit_with_balances(
+                session,
+                [
+                    BalanceDelta(
+                        student_id=deleted.student_id,
+                        school_id=deleted.school_id,
+                        paid=-paid,
+                        debt=-Decimal(debt),
+                    )
+                ],
+            )
+            return True
 
     async def get_payments(
         self,
         *,
         student_id: Optional[int] = None,
-    ) -> list[Payment]:
+        offset: int = 0,
+        limit: int = 10,
+        expand: Collection[str] = (),
+    ) -> tuple[list[Payment], int]:
         async with self.session_factory() as session:
+            invoice_path = selectinload(PaymentTable.invoice)
             stmt = select(PaymentTable).options(
-                selectinload(PaymentTable.invoice).selectinload(InvoiceTable.student),
-                selectinload(PaymentTable.invoice).selectinload(InvoiceTable.school),
+                invoice_path, *_expand_options(expand, invoice_path)
             )
 
             if student_id:
                 stmt = stmt.join(InvoiceTable).where(
                     InvoiceTable.student_id == student_id
                 )
+            stmt = stmt.order_by(PaymentTable.id)
 
-            result = await session.execute(stmt)
-            payments = result.scalars().all()
+            payments, total = await paginate(session, stmt, offset=offset, limit=limit)
+            return [to_payment(payment, expand) for payment in payments], total
 
-            return [
-                Payment(
-                    id=payment.id,
-                    ref=payment.ref,
-                    value=payment.value,
-                    date=payment.date,
-                    created_at=payment.created_at,
-                    invoice=Invoice(
-                        id=payment.invoice.id,
-                        ref=payment.invoice.ref,
-                        value=payment.invoice.value,
-                        date=payment.invoice.date,
-                        status=payment.invoice.status,
-                        created_at=payment.invoice.created_at,
-                        student=Student(
-                            id=payment.invoice.student.id,
-                            first_name=payment.invoice.student.first_name,
-                            last_name=payment.invoice.student.last_name,
-                            email=payment.invoice.student.email,
-                            age=payment.invoice.student.age,
-                            created_at=payment.invoice.student.created_at,
-                        ),
-                        school=School(
-                            id=payment.invoice.school.id,
-                            ref=payment.invoice.school.ref,
-                            name=payment.invoice.school.name,
-                            created_at=payment.invoice.school.created_at,
-                        ),
-                    ),
+    async def stream_payments(
+        self,
+        *,
+        student_id: Optional[int] = None,
+        expand: Collection[str] = (),
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Payment]:
+        """Yield every payment, holding at most ``batch_size`` rows in memory.
+
+        Rows are read through a server side cursor with ``yield_per``. The
+        invoice (and expanded relationships) are joined in the same query
+        because many-to-one joined loads are compatible with ``yield_per``.
+        """
+        async with self.session_factory() as session:
+            invoice_path = joinedload(PaymentTable.invoice)
+            options = [invoice_path]
+            if "student" in expand:
+                options.append(invoice_path.joinedload(InvoiceTable.student))
+            if "school" in expand:
+                options.append(invoice_path.joinedload(InvoiceTable.school))
+
+            stmt = select(PaymentTable).options(*options)
+            if student_id:
+                stmt = stmt.join(InvoiceTable).where(
+                    InvoiceTable.student_id == student_id
                 )
-                for payment in payments
-            ]
+            stmt = stmt.order_by(PaymentTable.id).execution_options(
+                yield_per=batch_size
+            )
+
+            payments = await session.stream_scalars(stmt)
+            async for payment in payments:
+                yield to_payment(payment, expand)
 
     async def create_payment(
         self,
@@ -365,7 +785,7 @@ class InvoiceRepository:
         value: float,
         date: datetime,
     ) -> Payment:
-        async with self.session_factory() as session:
+        async with self.session_factory(info=USE_PRIMARY) as session:
             payment_table = PaymentTable(
                 ref=ref,
                 invoice_id=invoice_id,
@@ -374,61 +794,138 @@ class InvoiceRepository:
                 created_at=datetime.now(),
             )
             session.add(payment_table)
-            await session.commit()
-            await session.refresh(payment_table)
+            owners = await session.execute(
+                select(InvoiceTable.student_id, InvoiceTable.school_id).where(
+                    InvoiceTable.id == invoice_id
+                )
+            )
+            owner = owners.one_or_none()
+            deltas = []
+            if owner is not None:
+                deltas.append(
+                    BalanceDelta(
+                        student_id=owner.student_id,
+                        school_id=owner.school_id,
+                        paid=Decimal(value),
+                    )
+                )
+            await session.flush()
 
-            # Reload with relationships
+            # Reload with the invoice relationship, in the same transaction so
+            # the request keeps a single connection
             stmt = (
                 select(PaymentTable)
-                .options(
-                    selectinload(PaymentTable.invoice).selectinload(
-                        InvoiceTable.student
-                    ),
-                    selectinload(PaymentTable.invoice).selectinload(
-                        InvoiceTable.school
-                    ),
-                )
+                .options(selectinload(PaymentTable.invoice))
                 .where(PaymentTable.id == payment_table.id)
+                .execution_options(populate_existing=True)
             )
             result = await session.execute(stmt)
-            payment = result.scalar_one()
-
-            return Payment(
-                id=payment.id,
-                ref=payment.ref,
-                value=payment.value,
-                date=payment.date,
-                created_at=payment.created_at,
-                invoice=Invoice(
-                    id=payment.invoice.id,
-                    ref=payment.invoice.ref,
-                    value=payment.invoice.value,
-                    date=payment.invoice.date,
-                    status=payment.invoice.status,
-                    created_at=payment.invoice.created_at,
-                    student=Student(
-                        id=payment.invoice.student.id,
-                        first_name=payment.invoice.student.first_name,
-                        last_name=payment.invoice.student.last_name,
-                        email=payment.invoice.student.email,
-                        age=payment.invoice.student.age,
-                        created_at=payment.invoice.student.created_at,
-                    ),
-                    school=School(
-                        id=payment.invoice.school.id,
-                        ref=payment.invoice.school.ref,
-                        name=payment.invoice.school.name,
-                        created_at=payment.invoice.school.created_at,
-                    ),
-                ),
+            payment = to_payment(result.scalar_one())
+            await _commit_with_balances(session, deltas)
+
+            return payment
+
+    async def create_payments_bulk(
+        self, payments: Sequence[Mapping[str, Any]]
+    ) -> tuple[int, list[BulkRowError]]:
+        """Insert a chunk of payments that reference invoices by ``invoice_ref``.
+
+        Invoice refs are resolved to ids and existing payment refs are found
+        with one query each for the whole chunk. Valid rows are inserted with
+        a single executemany in one transaction, together with their balance
+        deltas. Returns the number of inserted rows and the rejected ones.
+        """
+        errors: list[BulkRowError] = []
+        async with self.session_factory(info=USE_PRIMARY) as session:
+            invoice_refs = {row["invoice_ref"] for row in payments}
+            invoices = {
+                row.ref: row
+                for row in await session.execute(
+                    select(
+                        InvoiceTable.id,
+                        InvoiceTable.ref,
+                        InvoiceTable.student_id,
+                        InvoiceTable.school_id,
+                    ).where(InvoiceTable.ref.in_(invoice_refs))
+                )
+            }
+            taken_refs = set(
+                await session.scalars(
+                    select(PaymentTable.ref).where(
+                        PaymentTable.ref.in_([row["ref"] for row in payments])
+                    )
+                )
             )
 
+            values = []
+            deltas = []
+            now = datetime.now()
+            for index, row in enumerate(payments):
+                invoice = invoices.get(row["invoice_ref"])
+                detail = None
+                if invoice is None:
+                    detail = f"Invoice {row['invoice_ref']} not found"
+                elif row["ref"] in taken_refs:
+                    detail = f"Payment ref {row['ref']} already exists"
+
+                if detail:
+                    errors.append(
+                        BulkRowError(index=index, ref=row["ref"], detail=detail)
+                    )
+                    continue
+
+                taken_refs.add(row["ref"])
+                values.append(
+                    {
+                        "ref": row["ref"],
+                        "invoice_id": invoice.id,
+                        "value": Decimal(row["value"]),
+                        "date": row["date"],
+                        "created_at": now,
+                    }
+                )
+                deltas.append(
+                    BalanceDelta(
+                        student_id=invoice.student_id,
+                        school_id=invoice.school_id,
+                        paid=Decimal(row["value"]),
+                    )
+                )
+
+            if values:
+                await session.execute(insert(PaymentTable), values)
+                await _commit_with_balances(session, deltas)
+            return len(values), errors
+
     async def delete_payment(self, payment_id: int) -> bool:
-        async with self.session_factory() as session:
-            stmt = sql_delete(PaymentTable).where(PaymentTable.id == payment_id)
+        async with self.session_factory(info=USE_PRIMARY) as session:
+            stmt = (
+                sql_delete(PaymentTable)
+                .where(PaymentTable.id == payment_id)
+                .returning(PaymentTable.invoice_id, PaymentTable.value)
+            )
             result = await session.execute(stmt)
-            await session.commit()
-            return result.rowcount > 0
+            deleted = result.one_or_none()
+            if deleted is None:
+                return False
+
+            owners = await session.execute(
+                select(InvoiceTable.student_id, InvoiceTable.school_id).where(
+                    InvoiceTable.id == deleted.invoice_id
+                )
+            )
+            owner = owners.one_or_none()
+            deltas = []
+            if owner is not None:
+                deltas.append(
+                    BalanceDelta(
+                        student_id=owner.student_id,
+                        school_id=owner.school_id,
+                        paid=-Decimal(deleted.value),
+                    )
+                )
+            await _commit_with_balances(session, deltas)
+            return True
 
 
 # TODO: This class is not longer needed, it was created to avoid injecting multiple dependencies to services
@@ -450,3 +947,18 @@ class PostgresRepository:
 
     async def get_payments(self, **kwargs):
         return await self.invoice_repo.get_payments(**kwargs)
+
+    async def get_financial_status(self, student_id: int):
+        return await self.student_repo.get_financial_status(student_id)
+
+    async def get_financial_statuses(self, student_ids, **kwargs):
+        return await self.student_repo.get_financial_statuses(student_ids, **kwargs)
+
+    async def get_school_debt(self, school_id: int):
+        return await self.school_repo.get_school_debt(school_id)
+
+    async def get_school_students_version(self, school_id: int, **kwargs):
+        return await self.school_repo.get_school_students_version(school_id, **kwargs)
+
+    async def get_schools_debt(self, **kwargs):
+        return await self.school_repo.get_schools_debt(**kwargs)
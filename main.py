@@ -1,23 +1,39 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
 
-from routers import schools, students, invoices
-from infrastructure.database.db_engine import engine, Base
+from middlewares import MetricsMiddleware, ProfilerMiddleware
+from routers import cache, database, metrics, schools, students, invoices
+from infrastructure.database.db_engine import engine, pool_settings, read_engine
+from infrastructure.database.pool import check_connection, warm_up
+from infrastructure.profiler import ProfilerSettings
 from fastapi_pagination import add_pagination
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes are applied with `make migrate`, not on every worker start
+    for db_engine in filter(None, (engine, read_engine)):
+        await check_connection(db_engine)
+        await warm_up(db_engine, pool_settings.warmup)
+    yield
+    for db_engine in filter(None, (engine, read_engine)):
+        await db_engine.dispose()
 
 
-@app.on_event("startup")
-async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+app = FastAPI(lifespan=lifespan)
+profiler_settings = ProfilerSettings.from_env()
+if profiler_settings.enabled:
+    app.add_middleware(ProfilerMiddleware, settings=profiler_settings)
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(schools.router)
 app.include_router(students.router)
 app.include_router(invoices.router)
+app.include_router(cache.router)
+app.include_router(database.router)
+app.include_router(metrics.router)
 
 add_pagination(app)
 
@@ -0,0 +1,103 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.database.instrumentation import track_queries
+from infrastructure.metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+from infrastructure.profiler import (
+    ProfilerSettings,
+    log_profile,
+    profile_request,
+    server_timing,
+)
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route path, e.g. ``/students/{student_id}``.
+
+    Raw paths would create one time series per id, so requests that did not
+    match a route share a single label.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Record latency, status code and SQL usage of every HTTP request.
+
+    Written as a plain ASGI middleware so streaming responses are timed until
+    their last chunk and the query counter covers the queries made while
+    streaming.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        started = time.perf_counter()
+        try:
+            with track_queries() as queries:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method)
+            route = route_template(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route)
+            HTTP_REQUEST_DB_QUERIES.observe(queries.count, method=method, route=route)
+            HTTP_REQUEST_DB_DURATION.observe(
+                queries.seconds, method=method, route=route
+            )
+
+
+class ProfilerMiddleware:
+    """Profile the SQL of every request, see ``infrastructure.profiler``.
+
+    The ``Server-Timing`` header is written when the response starts, so for
+    streaming responses it leaves out the statements run while streaming; the
+    log written at the end of the request includes them.
+    """
+
+    def __init__(self, app: ASGIApp, settings: ProfilerSettings):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_request() as profile:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(profile))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                request = f"{scope['method']} {route_template(scope)}"
+                log_profile(profile, request, self.settings)
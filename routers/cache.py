@@ -0,0 +1,13 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from infrastructure.repositories.cache import cache
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+@router.get("/stats")
+async def cache_stats() -> dict[str, Any]:
+    """Hit, miss and eviction counters of the in-process read cache."""
+    return cache.snapshot()
@@ -0,0 +1,19 @@
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter
+
+from infrastructure.database.db_engine import engine, pool_settings, read_engine
+from infrastructure.database.pool import pool_stats
+
+router = APIRouter(prefix="/db", tags=["database"])
+
+
+@router.get("/pool")
+async def database_pool() -> dict[str, Any]:
+    """Connection pool usage of this worker for the primary and the replica."""
+    return {
+        "settings": asdict(pool_settings),
+        "primary": pool_stats(engine),
+        "replica": pool_stats(read_engine),
+    }
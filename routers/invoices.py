@@ -1,16 +1,33 @@
-from typing import Annotated
+import json
+from typing import Annotated, Any, AsyncIterator
 from datetime import datetime
 from decimal import Decimal
 from fastapi_pagination import Page, Params
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from dependencies import get_invoice_repository
-from domain.models.invoice import Invoice, Payment
+from domain.models.invoice import (
+    INVOICE_EXPANDABLE,
+    BulkRowError,
+    Invoice,
+    Payment,
+    PaymentImportReport,
+)
+from domain.models.pagination import CursorPage
+from infrastructure.database.import_payments import (
+    PaymentImportError,
+    import_payments,
+)
+from infrastructure.profiler import ProfiledRoute
+from infrastructure.repositories.pagination import InvalidCursorError
 from infrastructure.repositories.postgres import InvoiceRepository
+from responses import FastJSONResponse
 
-router = APIRouter(prefix="/invoices", tags=["invoices"])
+router = APIRouter(prefix="/invoices", tags=["invoices"], route_class=ProfiledRoute)
 
 
 class InvoiceCreate(BaseModel):
@@ -22,6 +39,11 @@ class InvoiceCreate(BaseModel):
     status: str
 
 
+class InvoiceBulkResult(BaseModel):
+    created: list[Invoice]
+    errors: list[BulkRowError]
+
+
 class PaymentCreate(BaseModel):
     ref: str
     invoice_id: int
@@ -29,21 +51,64 @@ class PaymentCreate(BaseModel):
     date: datetime
 
 
-@router.get("/", response_model=Page[Invoice])
+def parse_expand(expand: str | None = None) -> frozenset[str]:
+    """Turn ``expand=student,school`` into the set of relationships to load."""
+    if not expand:
+        return frozenset()
+
+    requested = frozenset(name.strip() for name in expand.split(",") if name.strip())
+    unknown = requested - INVOICE_EXPANDABLE
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown expand value(s): {', '.join(sorted(unknown))}",
+        )
+    return requested
+
+
+@router.get("/", response_model=Page[Invoice], response_class=FastJSONResponse)
 async def list_invoices(
     repo: Annotated[InvoiceRepository, Depends(get_invoice_repository)],
     school_id: int | None = None,
     student_id: int | None = None,
     params: Params = Depends(),
-) -> Page[Invoice]:
+    expand: frozenset[str] = Depends(parse_expand),
+) -> FastJSONResponse:
     offset = (params.page - 1) * params.size
     invoices, total = await repo.get_invoices(
         school_id=school_id,
         student_id=student_id,
         offset=offset,
         limit=params.size,
+        expand=expand,
+    )
+    return FastJSONResponse(Page.create(items=invoices, params=params, total=total))
+
+
+@router.get(
+    "/cursor", response_model=CursorPage[Invoice], response_class=FastJSONResponse
+)
+async def list_invoices_cursor(
+    repo: Annotated[InvoiceRepository, Depends(get_invoice_repository)],
+    school_id: int | None = None,
+    student_id: int | None = None,
+    after: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+    expand: frozenset[str] = Depends(parse_expand),
+) -> FastJSONResponse:
+    try:
+        invoices, next_cursor = await repo.get_invoices_keyset(
+            school_id=school_id,
+            student_id=student_id,
+            after=after,
+            limit=size,
+            expand=expand,
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return FastJSONResponse(
+        CursorPage(items=invoices, size=size, next_cursor=next_cursor)
     )
-    return Page.create(items=invoices, params=params, total=total)
 
 
 @router.post("/", response_model=Invoice, status_code=status.HTTP_201_CREATED)
@@ -61,6 +126,161 @@ async def create_invoice(
     )
 
 
+BULK_MAX_ROWS = 10_000
+# A generous budget per row, so oversized bodies are refused before parsing
+BULK_MAX_BYTES = BULK_MAX_ROWS * 1024
+
+invoice_create_adapter = TypeAdapter(InvoiceCreate)
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+        for err in error.errors(include_url=False)
+    )
+
+
+def _too_many_rows() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"At most {BULK_MAX_ROWS} invoices per request",
+    )
+
+
+async def _bulk_body_chunks(request: Request) -> AsyncIterator[bytes]:
+    """Stream the body, refusing it once it is larger than ``BULK_MAX_BYTES``.
+
+    A declared ``Content-Length`` is checked before anything is read, chunked
+    bodies while they arrive.
+    """
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > BULK_MAX_BYTES:
+        raise _too_many_rows()
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > BULK_MAX_BYTES:
+            raise _too_many_rows()
+        yield chunk
+
+
+def _append_ndjson_row(rows: list[Any], line: bytes) -> None:
+    if not line.strip():
+        return
+    if len(rows) >= BULK_MAX_ROWS:
+        raise _too_many_rows()
+    try:
+        rows.append(json.loads(line))
+    except ValueError as e:
+        rows.append(ValueError(f"Invalid JSON: {e}"))
+
+
+async def _read_bulk_rows(request: Request) -> list[Any]:
+    """Read a JSON array or an NDJSON body into a list of raw rows.
+
+    NDJSON lines that are not valid JSON are kept as ``ValueError`` entries so
+    they can be reported per row instead of failing the whole request. NDJSON
+    rows are parsed as the body streams in and counted against
+    ``BULK_MAX_ROWS`` on the way.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type:
+        rows: list[Any] = []
+        pending = b""
+        async for chunk in _bulk_body_chunks(request):
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                _append_ndjson_row(rows, line)
+        _append_ndjson_row(rows, pending)
+        return rows
+
+    body = b"".join([chunk async for chunk in _bulk_body_chunks(request)])
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be valid JSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array")
+    if len(rows) > BULK_MAX_ROWS:
+        raise _too_many_rows()
+    return rows
+
+
+@router.post(
+    "/bulk",
+    response_model=InvoiceBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/InvoiceCreate"},
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/InvoiceCreate"}
+                },
+            },
+            "required": True,
+        }
+    },
+)
+async def create_invoices_bulk(
+    request: Request,
+    response: Response,
+    repo: Annotated[InvoiceRepository, Depends(get_invoice_repository)],
+) -> InvoiceBulkResult:
+    """Create many invoices from a JSON array or an NDJSON body.
+
+    Invalid rows are reported in ``errors`` with their position in the body and
+    do not prevent the valid rows from being created.
+    """
+    rows = await _read_bulk_rows(request)
+
+    errors = []
+    valid_rows = []
+    positions = []
+    for index, row in enumerate(rows):
+        if isinstance(row, ValueError):
+            errors.append(BulkRowError(index=index, detail=str(row)))
+            continue
+        try:
+            invoice_data = invoice_create_adapter.validate_python(row)
+        except ValidationError as e:
+            ref = row.get("ref") if isinstance(row, dict) else None
+            errors.append(
+                BulkRowError(
+                    index=index,
+                    ref=ref if isinstance(ref, str) else None,
+                    detail=_format_validation_error(e),
+                )
+            )
+            continue
+        valid_rows.append(invoice_data.model_dump())
+        positions.append(index)
+
+    created = []
+    if valid_rows:
+        try:
+            created, row_errors = await repo.create_invoices_bulk(valid_rows)
+        except IntegrityError:
+            raise HTTPException(
+                status_code=409,
+                detail="Invoices conflict with concurrent writes, retry the batch",
+            )
+        errors.extend(
+            error.model_copy(update={"index": positions[error.index]})
+            for error in row_errors
+        )
+
+    if errors and not created:
+        response.status_code = 422
+    errors.sort(key=lambda error: error.index)
+    return InvoiceBulkResult(created=created, errors=errors)
+
+
 @router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_invoice(
     invoice_id: int,
@@ -71,12 +291,36 @@ async def delete_invoice(
         raise HTTPException(status_code=404, detail="Invoice not found")
 
 
-@router.get("/payments", response_model=list[Payment])
+@router.get("/payments", response_model=Page[Payment], response_class=FastJSONResponse)
 async def list_payments(
     repo: Annotated[InvoiceRepository, Depends(get_invoice_repository)],
     student_id: int | None = None,
-) -> list[Payment]:
-    return await repo.get_payments(student_id=student_id)
+    params: Params = Depends(),
+    expand: frozenset[str] = Depends(parse_expand),
+) -> FastJSONResponse:
+    offset = (params.page - 1) * params.size
+    payments, total = await repo.get_payments(
+        student_id=student_id,
+        offset=offset,
+        limit=params.size,
+        expand=expand,
+    )
+    return FastJSONResponse(Page.create(items=payments, params=params, total=total))
+
+
+@router.get("/payments/stream")
+async def stream_payments(
+    repo: Annotated[InvoiceRepository, Depends(get_invoice_repository)],
+    student_id: int | None = None,
+    expand: frozenset[str] = Depends(parse_expand),
+) -> StreamingResponse:
+    """Every payment as newline delimited JSON, one payment per line."""
+
+    async def lines():
+        async for payment in repo.stream_payments(student_id=student_id, expand=expand):
+            yield payment.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.post("/payments", response_model=Payment, status_code=status.HTTP_201_CREATED)
@@ -92,6 +336,36 @@ async def create_payment(
     )
 
 
+@router.post(
+    "/payments/import",
+    response_model=PaymentImportReport,
+    openapi_extra={
+        "requestBody": {
+            "content": {"text/csv": {"schema": {"type": "string"}}},
+            "required": True,
+        }
+    },
+)
+async def import_payments_csv(
+    request: Request,
+    response: Response,
+    repo: Annotated[InvoiceRepository, Depends(get_invoice_repository)],
+) -> PaymentImportReport:
+    """Import a ``ref,invoice_ref,value,date`` CSV of payments.
+
+    The body is parsed while it is received and inserted in chunks, rows that
+    fail are reported in ``errors`` and do not stop the import.
+    """
+    try:
+        report = await import_payments(repo, request.stream())
+    except PaymentImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if report.error_count and not report.imported:
+        response.status_code = 422
+    return report
+
+
 @router.delete("/payments/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_payment(
     payment_id: int,
@@ -2,27 +2,83 @@ import logging
 from typing import Annotated
 from fastapi_pagination import Page, Params
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from dependencies import get_school_service, get_school_repository
-from domain.models.school import School, SchoolCreate
+from domain.models.pagination import CursorPage
+from domain.models.school import (
+    SCHOOL_DEBT_SORTABLE,
+    School,
+    SchoolCreate,
+    SchoolDebt,
+)
 from domain.models.student import Student
 from domain.services.school_services import SchoolService
+from infrastructure.profiler import ProfiledRoute
+from infrastructure.repositories.pagination import InvalidCursorError
 from infrastructure.repositories.postgres import SchoolRepository
+from responses import (
+    FastJSONResponse,
+    cache_control,
+    cache_headers,
+    etag,
+    not_modified,
+)
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/schools", tags=["schools"])
+router = APIRouter(prefix="/schools", tags=["schools"], route_class=ProfiledRoute)
 
 
-@router.get("/", response_model=Page[School])
+@router.get("/", response_model=Page[School], response_class=FastJSONResponse)
 async def list_schools(
     repo: Annotated[SchoolRepository, Depends(get_school_repository)],
     params: Params = Depends(),
-) -> Page[School]:
+) -> FastJSONResponse:
     offset = (params.page - 1) * params.size
     schools, total = await repo.get_schools(offset=offset, limit=params.size)
-    return Page.create(items=schools, params=params, total=total)
+    return FastJSONResponse(Page.create(items=schools, params=params, total=total))
+
+
+@router.get(
+    "/cursor", response_model=CursorPage[School], response_class=FastJSONResponse
+)
+async def list_schools_cursor(
+    repo: Annotated[SchoolRepository, Depends(get_school_repository)],
+    after: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+) -> FastJSONResponse:
+    try:
+        schools, next_cursor = await repo.get_schools_keyset(after=after, limit=size)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return FastJSONResponse(
+        CursorPage(items=schools, size=size, next_cursor=next_cursor)
+    )
+
+
+def parse_debt_sort(sort: str = "-total_debt") -> str:
+    """Validate ``sort=-total_debt`` style values against the sortable fields."""
+    if sort.lstrip("-") not in SCHOOL_DEBT_SORTABLE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort field: {sort.lstrip('-')}",
+        )
+    return sort
+
+
+@router.get("/debt", response_model=Page[SchoolDebt], response_class=FastJSONResponse)
+async def list_schools_debt(
+    service: Annotated[SchoolService, Depends(get_school_service)],
+    sort: str = Depends(parse_debt_sort),
+    params: Params = Depends(),
+) -> FastJSONResponse:
+    """Every school with its pending debt, largest debt first by default."""
+    offset = (params.page - 1) * params.size
+    schools, total = await service.get_schools_debt(
+        sort=sort, offset=offset, limit=params.size
+    )
+    return FastJSONResponse(Page.create(items=schools, params=params, total=total))
 
 
 @router.post("/", response_model=School, status_code=status.HTTP_201_CREATED)
@@ -36,15 +92,34 @@ async def create_school(
     )
 
 
-@router.get("/{school_id}", response_model=School)
+SCHOOL_CACHE_CONTROL = cache_control("school")
+SCHOOL_STUDENTS_CACHE_CONTROL = cache_control("school_students")
+
+
+@router.get(
+    "/{school_id}",
+    response_model=School,
+    response_class=FastJSONResponse,
+    responses={304: {"description": "Not modified"}},
+)
 async def get_school(
     school_id: int,
+    request: Request,
     repo: Annotated[SchoolRepository, Depends(get_school_repository)],
-) -> School:
-    schools, _ = await repo.get_schools(filters={"id": school_id}, limit=1)
-    if not schools:
+) -> Response:
+    """Answers ``If-None-Match`` with a 304 while the school is unchanged."""
+    school = await repo.get_school(school_id)
+    if not school:
         raise HTTPException(status_code=404, detail="School not found")
-    return schools[0]
+
+    # schools are never updated, the id and creation time identify the row
+    headers = cache_headers(
+        etag("school", school.id, school.created_at), SCHOOL_CACHE_CONTROL
+    )
+    response = not_modified(request, headers)
+    if response is not None:
+        return response
+    return FastJSONResponse(school, headers=headers)
 
 
 @router.delete("/{school_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -57,13 +132,34 @@ async def delete_school(
         raise HTTPException(status_code=404, detail="School not found")
 
 
-@router.get("/{school_id}/students", response_model=Page[Student])
+@router.get(
+    "/{school_id}/students",
+    response_model=Page[Student],
+    response_class=FastJSONResponse,
+    responses={304: {"description": "Not modified"}},
+)
 async def list_school_students(
     school_id: int,
+    request: Request,
     service: Annotated[SchoolService, Depends(get_school_service)],
     active: bool = True,
     params: Params = Depends(),
-) -> Page[Student]:
+) -> Response:
+    """Answers ``If-None-Match`` with a 304 after a single version query."""
+    version = await service.get_school_students_version(
+        school_id=school_id, active=active
+    )
+    if version is None:
+        raise HTTPException(status_code=404, detail="School not found")
+
+    headers = cache_headers(
+        etag("school_students", school_id, active, params.page, params.size, version),
+        SCHOOL_STUDENTS_CACHE_CONTROL,
+    )
+    response = not_modified(request, headers)
+    if response is not None:
+        return response
+
     offset = (params.page - 1) * params.size
     result = await service.get_school_students(
         filters={"id": school_id},
@@ -75,7 +171,10 @@ async def list_school_students(
         raise HTTPException(status_code=404, detail="School not found")
 
     school, total = result
-    return Page.create(items=school.students, params=params, total=total)
+    return FastJSONResponse(
+        Page.create(items=school.students, params=params, total=total),
+        headers=headers,
+    )
 
 
 @router.get("/{school_id}/debt", response_model=School)
@@ -85,9 +184,10 @@ async def get_school_debt(
 ) -> School:
     try:
         school_debt = await service.get_school_debt(school_id=school_id)
-        if not school_debt:
-            raise HTTPException(status_code=404, detail="School not found")
-        return school_debt
-    except Exception as e:
-        logger.exception("Error getting school debt: {e}")
+    except Exception:
+        logger.exception("Error getting school debt for school %s", school_id)
         raise HTTPException(status_code=500, detail="Internal server error")
+
+    if not school_debt:
+        raise HTTPException(status_code=404, detail="School not found")
+    return school_debt
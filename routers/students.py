@@ -1,25 +1,52 @@
 from typing import Annotated
 from fastapi_pagination import Page, Params
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from dependencies import get_student_service, get_student_repository
-from domain.models.student import Student, StudentCreate
+from domain.models.pagination import CursorPage
+from domain.models.student import Student, StudentCreate, StudentIdsBatch
 from domain.services.student_services import StudentService
+from infrastructure.profiler import ProfiledRoute
+from infrastructure.repositories.pagination import InvalidCursorError
 from infrastructure.repositories.postgres import StudentRepository
+from responses import (
+    FastJSONResponse,
+    cache_control,
+    cache_headers,
+    etag,
+    not_modified,
+)
 
 
-router = APIRouter(prefix="/students", tags=["students"])
+router = APIRouter(prefix="/students", tags=["students"], route_class=ProfiledRoute)
 
 
-@router.get("/", response_model=Page[Student])
+@router.get("/", response_model=Page[Student], response_class=FastJSONResponse)
 async def list_students(
     repo: Annotated[StudentRepository, Depends(get_student_repository)],
     params: Params = Depends(),
-) -> Page[Student]:
+) -> FastJSONResponse:
     offset = (params.page - 1) * params.size
     students, total = await repo.get_students(offset=offset, limit=params.size)
-    return Page.create(items=students, params=params, total=total)
+    return FastJSONResponse(Page.create(items=students, params=params, total=total))
+
+
+@router.get(
+    "/cursor", response_model=CursorPage[Student], response_class=FastJSONResponse
+)
+async def list_students_cursor(
+    repo: Annotated[StudentRepository, Depends(get_student_repository)],
+    after: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+) -> FastJSONResponse:
+    try:
+        students, next_cursor = await repo.get_students_keyset(after=after, limit=size)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return FastJSONResponse(
+        CursorPage(items=students, size=size, next_cursor=next_cursor)
+    )
 
 
 @router.post("/", response_model=Student, status_code=status.HTTP_201_CREATED)
@@ -35,15 +62,55 @@ async def create_student(
     )
 
 
-@router.get("/{student_id}", response_model=Student)
+@router.post(
+    "/financial-status:batch",
+    response_model=Page[Student],
+    response_class=FastJSONResponse,
+)
+async def get_students_financial_status_batch(
+    batch: StudentIdsBatch,
+    service: Annotated[StudentService, Depends(get_student_service)],
+    params: Params = Depends(),
+) -> FastJSONResponse:
+    """Financial status of up to 1000 students, paginated and ordered by id.
+
+    Ids that do not match a student are left out of the page, more than
+    1000 ids fail validation with a 422.
+    """
+    offset = (params.page - 1) * params.size
+    students, total = await service.financial_statuses(
+        batch.ids, offset=offset, limit=params.size
+    )
+    return FastJSONResponse(Page.create(items=students, params=params, total=total))
+
+
+STUDENT_CACHE_CONTROL = cache_control("student")
+
+
+@router.get(
+    "/{student_id}",
+    response_model=Student,
+    response_class=FastJSONResponse,
+    responses={304: {"description": "Not modified"}},
+)
 async def get_student(
     student_id: int,
+    request: Request,
     repo: Annotated[StudentRepository, Depends(get_student_repository)],
-) -> Student:
-    students, _ = await repo.get_students(filters={"id": student_id}, limit=1)
-    if not students:
+) -> Response:
+    """Answers ``If-None-Match`` with a 304 while the student is unchanged."""
+    student = await repo.get_student(student_id)
+    if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return students[0]
+
+    # students are never updated, the id and creation time identify the row
+    headers = cache_headers(
+        etag("student", student.id, student.created_at), STUDENT_CACHE_CONTROL
+    )
+    response = not_modified(request, headers)
+    if response is not None:
+        return response
+    return FastJSONResponse(student, headers=headers)
 
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -4,8 +4,16 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from main import app
+from infrastructure.database.balances import rebuild_balances
 from infrastructure.database.db_engine import Base
-from infrastructure.database.orm import StudentTable, SchoolTable, InvoiceTable
+from infrastructure.database.instrumentation import instrument_engine
+from infrastructure.repositories.cache import cache
+from infrastructure.database.orm import (
+    StudentTable,
+    SchoolTable,
+    InvoiceTable,
+    PaymentTable,
+)
 
 
 # in memory database for integration tests
@@ -15,6 +23,7 @@ test_engine = create_async_engine(
     TEST_DATABASE_URL,
     echo=False,
 )
+instrument_engine(test_engine)
 
 TestAsyncSessionLocal = async_sessionmaker(
     bind=test_engine,
@@ -30,6 +39,8 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    # ids are reused by every test database, cached rows would leak across tests
+    cache.clear()
 
     async with TestAsyncSessionLocal() as session:
         yield session
@@ -38,30 +49,9 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 
 @pytest.fixture(scope="function")
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
-    from infrastructure.database.db_engine import AsyncSessionLocal
-    from dependencies import (
-        get_student_repository,
-        get_school_repository,
-        get_invoice_repository,
-    )
-    from infrastructure.repositories.postgres import (
-        StudentRepository,
-        SchoolRepository,
-        InvoiceRepository,
-    )
-
-    def override_student_repo():
-        return StudentRepository(session_factory=TestAsyncSessionLocal)
-
-    def override_school_repo():
-        return SchoolRepository(session_factory=TestAsyncSessionLocal)
-
-    def override_invoice_repo():
-        return InvoiceRepository(session_factory=TestAsyncSessionLocal)
-
-    app.dependency_overrides[get_student_repository] = override_student_repo
-    app.dependency_overrides[get_school_repository] = override_school_repo
-    app.dependency_overrides[get_invoice_repository] = override_invoice_repo
+    from dependencies import get_session_factory
+
+    app.dependency_overrides[get_session_factory] = lambda: TestAsyncSessionLocal
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -153,4 +143,37 @@ async def sample_invoices(db_session: AsyncSession, sample_students, sample_scho
     ]
     db_session.add_all(invoices)
     await db_session.commit()
+    # rows added straight to the session bypass the balance ledger
+    await rebuild_balances(db_session)
     return invoices
+
+
+@pytest.fixture(scope="function")
+async def sample_payments(db_session: AsyncSession, sample_invoices):
+    from decimal import Decimal
+    from datetime import datetime
+
+    payments = [
+        PaymentTable(
+            ref="PAY001",
+            invoice_id=sample_invoices[0].id,
+            value=Decimal("200.00"),
+            date=datetime.now(),
+        ),
+        PaymentTable(
+            ref="PAY002",
+            invoice_id=sample_invoices[0].id,
+            value=Decimal("100.00"),
+            date=datetime.now(),
+        ),
+        PaymentTable(
+            ref="PAY003",
+            invoice_id=sample_invoices[1].id,
+            value=Decimal("600.00"),
+            date=datetime.now(),
+        ),
+    ]
+    db_session.add_all(payments)
+    await db_session.commit()
+    await rebuild_balances(db_session)
+    return payments
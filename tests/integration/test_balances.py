@@ -0,0 +1,84 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from infrastructure.database.balances import check_balances, rebuild_balances
+from infrastructure.database.orm import StudentBalanceTable
+
+
+@pytest.mark.asyncio
+class TestIntegrationBalances:
+    async def _financial_status(self, client: AsyncClient, student_id: int):
+        response = await client.get(f"/students/{student_id}/financial-status")
+        assert response.status_code == 200
+        data = response.json()
+        return float(data["total_paid"]), float(data["total_debt"])
+
+    async def _school_debt(self, client: AsyncClient, school_id: int):
+        response = await client.get(f"/schools/{school_id}/debt")
+        assert response.status_code == 200
+        return float(response.json()["total_debt"])
+
+    async def test_ledger_follows_invoice_and_payment_writes(
+        self, client: AsyncClient, db_session, sample_students, sample_schools
+    ):
+        student_id = sample_students[0].id
+        school_id = sample_schools[0].id
+
+        response = await client.post(
+            "/invoices/",
+            json={
+                "ref": "INV100",
+                "student_id": student_id,
+                "school_id": school_id,
+                "value": "250.00",
+                "date": "2025-01-01T00:00:00",
+                "status": "PENDING",
+            },
+        )
+        assert response.status_code == 201
+        invoice_id = response.json()["id"]
+        assert await self._financial_status(client, student_id) == (0, 250.0)
+        assert await self._school_debt(client, school_id) == 250.0
+
+        response = await client.post(
+            "/invoices/payments",
+            json={
+                "ref": "PAY100",
+                "invoice_id": invoice_id,
+                "value": "100.00",
+                "date": "2025-01-05T00:00:00",
+            },
+        )
+        assert response.status_code == 201
+        payment_id = response.json()["id"]
+        assert await self._financial_status(client, student_id) == (100.0, 250.0)
+        assert await check_balances(db_session) == []
+
+        response = await client.delete(f"/invoices/payments/{payment_id}")
+        assert response.status_code == 204
+        assert await self._financial_status(client, student_id) == (0, 250.0)
+
+        response = await client.delete(f"/invoices/{invoice_id}")
+        assert response.status_code == 204
+        assert await self._financial_status(client, student_id) == (0, 0)
+        assert await self._school_debt(client, school_id) == 0
+        assert await check_balances(db_session) == []
+
+    async def test_check_detects_drift_and_rebuild_repairs_it(
+        self, db_session, sample_students, sample_invoices
+    ):
+        await db_session.execute(
+            update(StudentBalanceTable)
+            .where(StudentBalanceTable.student_id == sample_students[0].id)
+            .values(total_debt=0)
+        )
+        await db_session.commit()
+
+        mismatches = await check_balances(db_session)
+        assert [(m.scope, m.id) for m in mismatches] == [
+            ("student", sample_students[0].id)
+        ]
+
+        await rebuild_balances(db_session)
+        assert await check_balances(db_session) == []
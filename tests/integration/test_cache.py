@@ -0,0 +1,67 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+class TestIntegrationCache:
+    async def _stats(self, client: AsyncClient) -> dict:
+        response = await client.get("/cache/stats")
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_get_school_is_cached(self, client: AsyncClient, sample_schools):
+        school_id = sample_schools[0].id
+        for _ in range(3):
+            response = await client.get(f"/schools/{school_id}")
+            assert response.status_code == 200
+            assert response.json()["ref"] == "SCH001"
+
+        stats = await self._stats(client)
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+
+        response = await client.delete(f"/schools/{school_id}")
+        assert response.status_code == 204
+        response = await client.get(f"/schools/{school_id}")
+        assert response.status_code == 404
+
+    async def test_payment_invalidates_balances(
+        self, client: AsyncClient, sample_students, sample_schools, sample_invoices
+    ):
+        student_id = sample_students[0].id
+        school_id = sample_schools[0].id
+        response = await client.get(f"/students/{student_id}/financial-status")
+        assert float(response.json()["total_paid"]) == 0
+        response = await client.get(f"/schools/{school_id}/debt")
+        assert float(response.json()["total_debt"]) == 500.0
+
+        response = await client.post(
+            "/invoices/payments",
+            json={
+                "ref": "PAY100",
+                "invoice_id": sample_invoices[0].id,
+                "value": "120.00",
+                "date": "2025-01-01T00:00:00",
+            },
+        )
+        assert response.status_code == 201
+
+        response = await client.get(f"/students/{student_id}/financial-status")
+        assert float(response.json()["total_paid"]) == 120.0
+
+        response = await client.post(
+            "/invoices/",
+            json={
+                "ref": "INV100",
+                "student_id": student_id,
+                "school_id": school_id,
+                "value": "80.00",
+                "date": "2025-01-01T00:00:00",
+                "status": "PENDING",
+            },
+        )
+        assert response.status_code == 201
+        response = await client.get(f"/schools/{school_id}/debt")
+        assert float(response.json()["total_debt"]) == 580.0
+
+        stats = await self._stats(client)
+        assert stats["invalidations"] == 3
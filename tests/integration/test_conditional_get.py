@@ -0,0 +1,93 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.models.student import StudentStatus
+from infrastructure.database.orm import SchoolStudentsTable
+from infrastructure.metrics import HTTP_REQUEST_DB_QUERIES
+
+SCHOOL_STUDENTS_ROUTE = {"method": "GET", "route": "/schools/{school_id}/students"}
+
+
+async def enroll(db_session: AsyncSession, school, *students) -> None:
+    db_session.add_all(
+        SchoolStudentsTable(
+            school_id=school.id,
+            student_id=student.id,
+            status=StudentStatus.ACTIVE.value,
+        )
+        for student in students
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+class TestIntegrationConditionalGet:
+    async def test_student_not_modified(self, client: AsyncClient, sample_students):
+        url = f"/students/{sample_students[0].id}"
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "private, no-cache"
+        tag = response.headers["etag"]
+        assert tag.startswith('"')
+
+        response = await client.get(url, headers={"If-None-Match": tag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == tag
+
+        response = await client.get(url, headers={"If-None-Match": f'"x", W/{tag}'})
+        assert response.status_code == 304
+
+        response = await client.get(url, headers={"If-None-Match": '"x"'})
+        assert response.status_code == 200
+        assert response.json()["id"] == sample_students[0].id
+
+    async def test_school_etags_differ_per_school(
+        self, client: AsyncClient, sample_schools
+    ):
+        first = await client.get(f"/schools/{sample_schools[0].id}")
+        second = await client.get(f"/schools/{sample_schools[1].id}")
+        assert first.headers["etag"] != second.headers["etag"]
+
+        response = await client.get(
+            f"/schools/{sample_schools[1].id}",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert response.status_code == 200
+
+    async def test_school_students_change_with_enrollments(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_schools,
+        sample_students,
+    ):
+        school = sample_schools[0]
+        url = f"/schools/{school.id}/students"
+        await enroll(db_session, school, sample_students[0])
+
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        tag = response.headers["etag"]
+
+        queries = HTTP_REQUEST_DB_QUERIES.sum(**SCHOOL_STUDENTS_ROUTE)
+        response = await client.get(url, headers={"If-None-Match": tag})
+        assert response.status_code == 304
+        # only the version query, the students are not read
+        assert HTTP_REQUEST_DB_QUERIES.sum(**SCHOOL_STUDENTS_ROUTE) == queries + 1
+
+        other_page = await client.get(f"{url}?size=1", headers={"If-None-Match": tag})
+        assert other_page.status_code == 200
+
+        await enroll(db_session, school, sample_students[1])
+        response = await client.get(url, headers={"If-None-Match": tag})
+        assert response.status_code == 200
+        assert response.json()["total"] == 2
+        assert response.headers["etag"] != tag
+
+    async def test_school_students_not_found(self, client: AsyncClient):
+        response = await client.get("/schools/99999/students")
+        assert response.status_code == 404
+        assert "etag" not in response.headers
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import func, select
+
+from infrastructure.database.balances import check_balances
+from infrastructure.database.generate import GenerateSpec, generate
+from infrastructure.database.orm import InvoiceTable, PaymentTable, StudentTable
+
+SPEC = GenerateSpec(schools=2, students_per_school=5, invoices_per_student=6, seed=1)
+
+
+async def _count(session, table) -> int:
+    return await session.scalar(select(func.count()).select_from(table))
+
+
+@pytest.mark.asyncio
+class TestIntegrationGenerate:
+    async def test_generates_rows_in_chunks_and_balances(self, db_session):
+        progress = []
+        report = await generate(
+            db_session.bind, SPEC, chunk_size=7, on_progress=progress.append
+        )
+
+        assert report.rows["students"] == await _count(db_session, StudentTable) == 10
+        assert report.rows["invoices"] == await _count(db_session, InvoiceTable) == 60
+        assert report.rows["payments"] == await _count(db_session, PaymentTable)
+        assert len(progress) > 1
+        assert await check_balances(db_session) == []
+
+    async def test_refuses_a_database_with_data(self, db_session, sample_schools):
+        with pytest.raises(ValueError):
+            await generate(db_session.bind, SPEC)
+
+        report = await generate(db_session.bind, SPEC, truncate=True)
+        assert report.rows["schools"] == 2
+        refs = (await db_session.scalars(select(InvoiceTable.ref).limit(1))).all()
+        assert refs == ["INV000000001"]
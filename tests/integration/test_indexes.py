@@ -0,0 +1,173 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from domain.models.invoice import InvoiceStatus
+from domain.models.student import StudentStatus
+from infrastructure.database.balances import check_balances
+from infrastructure.database.migrations import current_version, load_migrations, migrate
+from infrastructure.database.orm import (
+    INVOICE_IS_PENDING,
+    InvoiceTable,
+    PaymentTable,
+    SchoolTable,
+    StudentBalanceTable,
+    StudentTable,
+)
+from infrastructure.repositories.postgres import InvoiceRepository, StudentRepository
+
+
+async def explain(session: AsyncSession, stmt) -> str:
+    compiled = stmt.compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    result = await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    return "\n".join(row.detail for row in result)
+
+
+@pytest.mark.asyncio
+class TestIntegrationIndexes:
+    async def test_invoices_by_school_page(self, db_session: AsyncSession):
+        stmt = (
+            InvoiceRepository(session_factory=None)
+            ._invoices_query(school_id=1)
+            .order_by(InvoiceTable.created_at, InvoiceTable.id)
+            .limit(10)
+        )
+        plan = await explain(db_session, stmt)
+        assert "USING INDEX ix_invoices_school_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_invoices_by_student_page(self, db_session: AsyncSession):
+        stmt = (
+            InvoiceRepository(session_factory=None)
+            ._invoices_query(student_id=1)
+            .order_by(InvoiceTable.created_at, InvoiceTable.id)
+            .limit(10)
+        )
+        plan = await explain(db_session, stmt)
+        assert "USING INDEX ix_invoices_student_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_invoices_keyset_seek(self, db_session: AsyncSession):
+        stmt = (
+            select(InvoiceTable)
+            .where(
+                tuple_(InvoiceTable.created_at, InvoiceTable.id)
+                > tuple_(datetime(2025, 1, 1), 100)
+            )
+            .order_by(InvoiceTable.created_at, InvoiceTable.id)
+            .limit(11)
+        )
+        plan = await explain(db_session, stmt)
+        assert "SEARCH invoices USING INDEX ix_invoices_created_at_id" in plan
+
+    async def test_pending_debt_by_school(self, db_session: AsyncSession):
+        stmt = (
+            select(
+                InvoiceTable.school_id,
+                func.sum(InvoiceTable.value),
+                func.min(InvoiceTable.date),
+            )
+            .where(INVOICE_IS_PENDING)
+            .group_by(InvoiceTable.school_id)
+        )
+        plan = await explain(db_session, stmt)
+        assert "USING INDEX ix_invoices_pending_school" in plan
+
+    async def test_payments_by_invoice(self, db_session: AsyncSession):
+        stmt = select(func.sum(PaymentTable.value)).where(PaymentTable.invoice_id == 1)
+        plan = await explain(db_session, stmt)
+        assert "USING COVERING INDEX ix_payments_invoice_id" in plan
+
+    async def test_school_students_by_status(self, db_session: AsyncSession):
+        stmt = (
+            StudentRepository(session_factory=None)
+            ._students_query(school_id=1, status=StudentStatus.ACTIVE.value)
+            .order_by(StudentTable.id)
+            .limit(10)
+        )
+        plan = await explain(db_session, stmt)
+        assert "USING COVERING INDEX ix_school_students_school_status_student" in plan
+
+
+@pytest.mark.asyncio
+class TestIntegrationMigrations:
+    async def test_migrate_fresh_database(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        versions = [migration.version for migration in load_migrations()]
+
+        applied = await migrate(engine)
+        assert [migration.version for migration in applied] == versions
+        assert await current_version(engine) == versions[-1]
+
+        async with engine.connect() as conn:
+            result = await conn.execute(text("PRAGMA index_list('invoices')"))
+            index_names = {row.name for row in result}
+        assert "ix_invoices_pending_school" in index_names
+
+        assert await migrate(engine) == []
+        await engine.dispose()
+
+    async def test_ledger_migration_fills_existing_data(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        await migrate(engine, target=2)
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table'")
+            )
+            tables = {row.name for row in result}
+        # m0001 only has the original tables, the ledger comes with m0003
+        assert {"students", "invoices", "payments"} <= tables
+        assert "student_balances" not in tables
+        now = datetime(2025, 1, 1)
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(StudentTable),
+                [dict(id=1, first_name="A", last_name="B", email="a@b.c", age=10)],
+            )
+            await conn.execute(insert(SchoolTable), [dict(id=1, ref="S1", name="S")])
+            await conn.execute(
+                insert(InvoiceTable),
+                [
+                    dict(
+                        id=i,
+                        ref=f"INV{i}",
+                        value=Decimal("100.00"),
+                        date=now,
+                        status=status,
+                        student_id=1,
+                        school_id=1,
+                    )
+                    for i, status in (
+                        (1, InvoiceStatus.PENDING),
+                        (2, InvoiceStatus.PAID),
+                    )
+                ],
+            )
+            await conn.execute(
+                insert(PaymentTable),
+                [
+                    dict(
+                        id=1,
+                        ref="PAY1",
+                        value=Decimal("100.00"),
+                        date=now,
+                        invoice_id=2,
+                    )
+                ],
+            )
+
+        await migrate(engine)
+        async with AsyncSession(engine) as session:
+            assert await check_balances(session) == []
+            balance = await session.get(StudentBalanceTable, 1)
+        assert (balance.total_paid, balance.total_debt) == (
+            Decimal("100.00"),
+            Decimal("100.00"),
+        )
+        await engine.dispose()
@@ -1,6 +1,12 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 
+from infrastructure.database.balances import check_balances
+from infrastructure.metrics import HTTP_REQUEST_DB_QUERIES
+from routers import invoices
+
 
 @pytest.mark.asyncio
 class TestIntegrationInvoices:
@@ -65,3 +71,293 @@ class TestIntegrationInvoices:
         invoice_refs = [invoice["ref"] for invoice in data["items"]]
         assert "INV001" in invoice_refs
         assert "INV002" in invoice_refs
+
+    async def test_list_invoices_page_out_of_range(
+        self, client: AsyncClient, sample_invoices
+    ):
+        response = await client.get("/invoices/?page=5&size=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["items"] == []
+
+    async def test_list_invoices_cursor_walks_all_pages(
+        self, client: AsyncClient, sample_invoices
+    ):
+        refs = []
+        after = None
+        for _ in range(3):
+            params = {"size": 2, **({"after": after} if after else {})}
+            response = await client.get("/invoices/cursor", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            refs.extend(invoice["ref"] for invoice in data["items"])
+            after = data["next_cursor"]
+            if after is None:
+                break
+
+        assert refs == ["INV001", "INV002", "INV003"]
+        assert after is None
+
+    async def test_list_invoices_cursor_invalid(self, client: AsyncClient):
+        response = await client.get("/invoices/cursor?after=not-a-cursor")
+        assert response.status_code == 400
+
+    async def test_list_invoices_slim_by_default(
+        self, client: AsyncClient, sample_invoices, sample_students, sample_schools
+    ):
+        response = await client.get(f"/invoices/?student_id={sample_students[0].id}")
+        assert response.status_code == 200
+        invoice = response.json()["items"][0]
+        assert invoice["student"] == sample_students[0].id
+        assert invoice["school"] == sample_schools[0].id
+
+    async def test_list_invoices_expand(
+        self, client: AsyncClient, sample_invoices, sample_students, sample_schools
+    ):
+        response = await client.get(
+            f"/invoices/?student_id={sample_students[0].id}&expand=student,school"
+        )
+        assert response.status_code == 200
+        invoice = response.json()["items"][0]
+        assert invoice["student"]["email"] == "alice@test.com"
+        assert invoice["school"]["ref"] == "SCH001"
+
+        response = await client.get("/invoices/?expand=school")
+        assert response.status_code == 200
+        invoice = response.json()["items"][0]
+        assert isinstance(invoice["student"], int)
+        assert invoice["school"]["ref"] == "SCH001"
+
+    async def test_list_invoices_expand_unknown(self, client: AsyncClient):
+        response = await client.get("/invoices/?expand=teacher")
+        assert response.status_code == 400
+
+    async def test_list_payments_expand(self, client: AsyncClient, sample_payments):
+        response = await client.get("/invoices/payments")
+        assert response.status_code == 200
+        payments = response.json()["items"]
+        assert len(payments) == 3
+        assert isinstance(payments[0]["invoice"]["student"], int)
+
+        response = await client.get("/invoices/payments?expand=student")
+        assert response.status_code == 200
+        payment = response.json()["items"][0]
+        assert payment["invoice"]["student"]["email"] == "alice@test.com"
+
+    async def test_list_payments_pagination(
+        self, client: AsyncClient, sample_payments, sample_students
+    ):
+        response = await client.get("/invoices/payments?page=1&size=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert [p["ref"] for p in data["items"]] == ["PAY001", "PAY002"]
+
+        response = await client.get(
+            f"/invoices/payments?student_id={sample_students[1].id}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["ref"] == "PAY003"
+
+    async def test_stream_payments(self, client: AsyncClient, sample_payments):
+        async with client.stream("GET", "/invoices/payments/stream") as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = [line async for line in response.aiter_lines() if line]
+
+        payments = [json.loads(line) for line in lines]
+        assert [p["ref"] for p in payments] == ["PAY001", "PAY002", "PAY003"]
+        assert isinstance(payments[0]["invoice"]["student"], int)
+
+    async def test_stream_payments_filtered_and_expanded(
+        self, client: AsyncClient, sample_payments, sample_students
+    ):
+        response = await client.get(
+            "/invoices/payments/stream",
+            params={"student_id": sample_students[0].id, "expand": "student"},
+        )
+        assert response.status_code == 200
+        payments = [json.loads(line) for line in response.text.splitlines()]
+        assert [p["ref"] for p in payments] == ["PAY001", "PAY002"]
+        assert payments[0]["invoice"]["student"]["email"] == "alice@test.com"
+
+    async def test_bulk_create_invoices_json(
+        self, client: AsyncClient, sample_students, sample_schools, sample_invoices
+    ):
+        row = {
+            "student_id": sample_students[0].id,
+            "school_id": sample_schools[0].id,
+            "value": "100.00",
+            "date": "2025-02-01T00:00:00",
+            "status": "PENDING",
+        }
+        body = [
+            {**row, "ref": "BULK001"},
+            {**row, "ref": "BULK002", "status": "PAID"},
+            {**row, "ref": "INV001"},
+            {**row, "ref": "BULK003", "student_id": 99999},
+            {**row, "ref": "BULK001"},
+            {"ref": "BULK004"},
+        ]
+        response = await client.post("/invoices/bulk", json=body)
+        assert response.status_code == 201
+        data = response.json()
+        assert [invoice["ref"] for invoice in data["created"]] == ["BULK001", "BULK002"]
+        assert [error["index"] for error in data["errors"]] == [2, 3, 4, 5]
+        assert data["errors"][0]["detail"] == "Invoice ref INV001 already exists"
+
+        status_response = await client.get(
+            f"/students/{sample_students[0].id}/financial-status"
+        )
+        assert float(status_response.json()["total_debt"]) == 600.0
+
+    async def test_bulk_create_invoices_ndjson(
+        self, client: AsyncClient, sample_students, sample_schools
+    ):
+        lines = [
+            json.dumps(
+                {
+                    "ref": f"ND{i}",
+                    "student_id": sample_students[i].id,
+                    "school_id": sample_schools[0].id,
+                    "value": "10.00",
+                    "date": "2025-02-01T00:00:00",
+                    "status": "PENDING",
+                }
+            )
+            for i in range(3)
+        ]
+        body = "\n".join([lines[0], "{not json", lines[1], "", lines[2]])
+        response = await client.post(
+            "/invoices/bulk",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert [invoice["ref"] for invoice in data["created"]] == ["ND0", "ND1", "ND2"]
+        assert [error["index"] for error in data["errors"]] == [1]
+
+    async def test_bulk_create_invoices_batches_the_insert(
+        self, client: AsyncClient, sample_students, sample_schools
+    ):
+        body = [
+            {
+                "ref": f"BATCH{i:03d}",
+                "student_id": sample_students[i % 3].id,
+                "school_id": sample_schools[0].id,
+                "value": "10.00",
+                "date": "2025-02-01T00:00:00",
+                "status": "PENDING",
+            }
+            for i in range(100)
+        ]
+        route = {"method": "POST", "route": "/invoices/bulk"}
+        queries = HTTP_REQUEST_DB_QUERIES.sum(**route)
+        response = await client.post("/invoices/bulk", json=body)
+        assert response.status_code == 201
+        created = response.json()["created"]
+        assert [invoice["ref"] for invoice in created] == [row["ref"] for row in body]
+        # not one INSERT per row, which ordered RETURNING falls back to on SQLite
+        assert HTTP_REQUEST_DB_QUERIES.sum(**route) - queries < 10
+
+    async def test_bulk_create_invoices_all_invalid(self, client: AsyncClient):
+        response = await client.post("/invoices/bulk", json=[{"ref": "X"}])
+        assert response.status_code == 422
+        assert response.json()["created"] == []
+
+        response = await client.post("/invoices/bulk", json={"ref": "X"})
+        assert response.status_code == 400
+
+    async def test_bulk_create_invoices_too_large(
+        self, client: AsyncClient, monkeypatch
+    ):
+        monkeypatch.setattr(invoices, "BULK_MAX_ROWS", 2)
+        row = json.dumps({"ref": "X"})
+
+        response = await client.post(
+            "/invoices/bulk",
+            content="\n".join([row] * 3),
+            headers={"content-type": "application/x-ndjson"},
+        )
+        assert response.status_code == 413
+        response = await client.post("/invoices/bulk", json=[{"ref": "X"}] * 3)
+        assert response.status_code == 413
+
+        # refused from the Content-Length, before the body is parsed
+        monkeypatch.setattr(invoices, "BULK_MAX_BYTES", 10)
+        response = await client.post("/invoices/bulk", content="[" + " " * 20 + "]")
+        assert response.status_code == 413
+
+        async def chunked():
+            yield b"[" + b" " * 8
+            yield b" " * 8 + b"]"
+
+        response = await client.post("/invoices/bulk", content=chunked())
+        assert response.status_code == 413
+
+    async def test_import_payments_csv(
+        self, client: AsyncClient, sample_students, sample_invoices, sample_payments
+    ):
+        body = "\n".join(
+            [
+                "ref,invoice_ref,value,date",
+                "IMP001,INV001,50.00,2025-02-01T00:00:00",
+                "IMP002,INV999,50.00,2025-02-01T00:00:00",
+                "PAY001,INV001,50.00,2025-02-01T00:00:00",
+                "IMP003,INV001,abc,2025-02-01T00:00:00",
+                "IMP004,INV001",
+                "IMP005,INV002,25.00,2025-02-01T00:00:00",
+            ]
+        )
+        response = await client.post(
+            "/invoices/payments/import",
+            content=body.encode(),
+            headers={"content-type": "text/csv"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows"] == 6
+        assert data["imported"] == 2
+        assert data["error_count"] == 4
+        assert [error["index"] for error in data["errors"]] == [1, 2, 3, 4]
+        assert data["errors"][0]["detail"] == "Invoice INV999 not found"
+
+        status_response = await client.get(
+            f"/students/{sample_students[0].id}/financial-status"
+        )
+        assert float(status_response.json()["total_paid"]) == 350.0
+
+    async def test_import_payments_csv_invalid_file(self, client: AsyncClient):
+        response = await client.post(
+            "/invoices/payments/import", content=b"ref,value\nX,1"
+        )
+        assert response.status_code == 400
+
+        response = await client.post(
+            "/invoices/payments/import",
+            content=b"ref,invoice_ref,value,date\nX,INV404,1,2025-01-01",
+        )
+        assert response.status_code == 422
+        assert response.json()["imported"] == 0
+
+    async def test_delete_paid_invoice_deletes_its_payments(
+        self, client: AsyncClient, db_session, sample_payments, sample_students
+    ):
+        invoice_id = sample_payments[2].invoice_id
+
+        response = await client.delete(f"/invoices/{invoice_id}")
+        assert response.status_code == 204
+
+        response = await client.get("/invoices/payments")
+        refs = {payment["ref"] for payment in response.json()["items"]}
+        assert refs == {"PAY001", "PAY002"}
+        assert await check_balances(db_session) == []
+
+        response = await client.get(
+            f"/students/{sample_students[1].id}/financial-status"
+        )
+        assert float(response.json()["total_paid"]) == 0.0
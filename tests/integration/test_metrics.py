@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient
+
+from infrastructure.metrics import (
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+STUDENT_ROUTE = {"method": "GET", "route": "/students/{student_id}"}
+
+
+@pytest.mark.asyncio
+class TestIntegrationMetrics:
+    async def test_requests_are_recorded_by_route(
+        self, client: AsyncClient, sample_students
+    ):
+        ok = HTTP_REQUESTS.get(status="200", **STUDENT_ROUTE)
+        not_found = HTTP_REQUESTS.get(status="404", **STUDENT_ROUTE)
+        observed = HTTP_REQUEST_DB_QUERIES.count(**STUDENT_ROUTE)
+        queries = HTTP_REQUEST_DB_QUERIES.sum(**STUDENT_ROUTE)
+
+        await client.get(f"/students/{sample_students[0].id}")
+        await client.get("/students/99999")
+        await client.get("/no/such/path")
+
+        assert HTTP_REQUESTS.get(status="200", **STUDENT_ROUTE) == ok + 1
+        assert HTTP_REQUESTS.get(status="404", **STUDENT_ROUTE) == not_found + 1
+        assert HTTP_REQUESTS.get(method="GET", route="unmatched", status="404") >= 1
+        assert HTTP_REQUEST_DB_QUERIES.count(**STUDENT_ROUTE) == observed + 2
+        # one lookup each, nothing is cached for the missing student
+        assert HTTP_REQUEST_DB_QUERIES.sum(**STUDENT_ROUTE) == queries + 2
+        assert HTTP_REQUESTS_IN_PROGRESS.get(method="GET") == 0
+
+    async def test_metrics_endpoint(self, client: AsyncClient, sample_students):
+        await client.get(f"/students/{sample_students[0].id}")
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert (
+            'http_request_duration_seconds_bucket{method="GET",'
+            'route="/students/{student_id}",le="+Inf"}'
+        ) in body
+        assert "db_queries_total" in body
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.database.pool import (
+    InstrumentedAsyncPool,
+    check_connection,
+    PoolSettings,
+    engine_options,
+    pool_size_for_budget,
+    pool_stats,
+    warm_up,
+)
+
+
+def test_pool_size_for_budget():
+    assert pool_size_for_budget(max_connections=80, workers=1) == (5, 10)
+    assert pool_size_for_budget(max_connections=80, workers=8) == (5, 5)
+    assert pool_size_for_budget(max_connections=80, workers=32) == (2, 0)
+    assert pool_size_for_budget(max_connections=10, workers=40) == (1, 0)
+
+
+def test_warmup_follows_the_pool_size(monkeypatch):
+    monkeypatch.delenv("DB_POOL_WARMUP", raising=False)
+    monkeypatch.setenv("DB_MAX_CONNECTIONS", "80")
+    monkeypatch.setenv("DB_POOL_SIZE", "2")
+    assert PoolSettings.from_env().warmup == 2
+
+    monkeypatch.setenv("DB_POOL_WARMUP", "4")
+    assert PoolSettings.from_env().warmup == 2
+
+    monkeypatch.setenv("DB_POOL_WARMUP", "1")
+    assert PoolSettings.from_env().warmup == 1
+
+
+def test_engine_options_only_tune_postgres():
+    settings = PoolSettings(size=3, statement_cache_size=0)
+    options = engine_options("postgresql+asyncpg://u:p@db/schools", settings)
+    assert options["poolclass"] is InstrumentedAsyncPool
+    assert options["pool_size"] == 3
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+    assert engine_options("sqlite+aiosqlite:///x.db", settings) == {
+        "pool_pre_ping": True
+    }
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_counts_waits(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+    )
+
+    async def query(delay: float):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(delay)
+
+    await asyncio.gather(query(0.05), query(0))
+    stats = pool_stats(engine)
+    assert stats["checkouts"] == 2
+    assert stats["waits"] == 1
+    assert stats["wait_seconds"] > 0
+    assert stats["checked_out"] == 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_endpoint(client: AsyncClient):
+    response = await client.get("/db/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["settings"]["size"] >= 1
+    assert data["primary"]["pool"] == "InstrumentedAsyncPool"
+    assert data["replica"] is None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_the_pool(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=3,
+        max_overflow=0,
+    )
+    await check_connection(engine)
+    await warm_up(engine, 10)
+    stats = pool_stats(engine)
+    assert stats["checked_in"] == 3
+    assert stats["checked_out"] == 0
+    await engine.dispose()
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from infrastructure.profiler import ProfilerSettings
+from main import app
+from middlewares import ProfilerMiddleware
+
+
+@pytest.fixture
+async def profiled_client(client: AsyncClient):
+    # the app under test has no profiler unless PROFILING_ENABLED was set
+    settings = ProfilerSettings(enabled=True, slow_statements=2, n_plus_one_threshold=1)
+    transport = ASGITransport(app=ProfilerMiddleware(app, settings=settings))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+class TestIntegrationProfiler:
+    async def test_server_timing_header(
+        self, profiled_client: AsyncClient, sample_students
+    ):
+        response = await profiled_client.get(
+            f"/students/{sample_students[0].id}/financial-status"
+        )
+
+        assert response.status_code == 200
+        metrics = dict(
+            metric.strip().split(";", 1)
+            for metric in response.headers["server-timing"].split(",")
+        )
+        assert metrics["db"].startswith("dur=")
+        assert int(metrics["db-queries"].removeprefix("desc=").strip('"')) > 0
+        assert metrics["serialize"].startswith("dur=")
+
+    async def test_logs_statements_without_parameters(
+        self, profiled_client: AsyncClient, sample_students, caplog
+    ):
+        caplog.set_level(logging.INFO, logger="infrastructure.profiler")
+        await profiled_client.get(f"/students/{sample_students[0].id}")
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any(
+            message.startswith("GET /students/{student_id}: 1 statements")
+            for message in messages
+        )
+        # parameters are never logged, only the statement shape
+        assert not any(sample_students[0].email in message for message in messages)
+        assert not any("N+1" in message for message in messages)
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.database.db_engine import Base
+from infrastructure.database.routing import create_session_factory
+from infrastructure.repositories.postgres import SchoolRepository
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.asyncio
+class TestIntegrationReadReplica:
+    async def test_reads_go_to_the_replica(self, engines):
+        primary, replica = engines
+        repo = SchoolRepository(
+            session_factory=create_session_factory(primary, replica)
+        )
+
+        # Two unrelated files never replicate, so a row is only visible on the
+        # engine it was read from
+        school = await repo.create_school(ref="SCH001", name="Primary School")
+        assert school.id is not None
+
+        schools, total = await repo.get_schools()
+        assert (schools, total) == ([], 0)
+
+        replica_repo = SchoolRepository(session_factory=create_session_factory(replica))
+        await replica_repo.create_school(ref="SCH900", name="Replica School")
+        schools, _ = await repo.get_schools()
+        assert [s.ref for s in schools] == ["SCH900"]
+
+    async def test_read_your_writes_window(self, engines):
+        primary, replica = engines
+        repo = SchoolRepository(
+            session_factory=create_session_factory(
+                primary, replica, read_your_writes=60
+            )
+        )
+        schools, _ = await repo.get_schools()
+        assert schools == []
+
+        await repo.create_school(ref="SCH001", name="Primary School")
+        schools, _ = await repo.get_schools()
+        assert [s.ref for s in schools] == ["SCH001"]
+
+    async def test_without_replica_everything_uses_the_primary(self, engines):
+        primary, _ = engines
+        repo = SchoolRepository(session_factory=create_session_factory(primary))
+        await repo.create_school(ref="SCH001", name="Primary School")
+        schools, _ = await repo.get_schools()
+        assert [s.ref for s in schools] == ["SCH001"]
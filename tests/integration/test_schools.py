@@ -53,8 +53,52 @@ class TestIntegrationSchools:
         data = response.json()
         assert "total_debt" in data
         assert data["id"] == school_id
+        # INV001 is pending, INV002 is already paid
+        assert float(data["total_debt"]) == 500.0
+
+    @pytest.mark.asyncio
+    async def test_get_school_debt_without_invoices(
+        self, client: AsyncClient, sample_schools, sample_invoices
+    ):
+        school_id = sample_schools[2].id
+        response = await client.get(f"/schools/{school_id}/debt")
+        assert response.status_code == 200
+        assert float(response.json()["total_debt"]) == 0
 
     @pytest.mark.asyncio
     async def test_get_school_debt_not_found(self, client: AsyncClient):
         response = await client.get("/schools/99999/debt")
         assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_schools_cursor(self, client: AsyncClient, sample_schools):
+        response = await client.get("/schools/cursor?size=3")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 3
+        assert data["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_list_schools_debt(
+        self, client: AsyncClient, sample_schools, sample_invoices
+    ):
+        response = await client.get("/schools/debt")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert [s["ref"] for s in data["items"]] == ["SCH001", "SCH002", "SCH003"]
+        first, _, last = data["items"]
+        assert float(first["total_debt"]) == 500.0
+        assert first["pending_invoices"] == 1
+        assert first["oldest_pending_date"] is not None
+        assert float(last["total_debt"]) == 0
+        assert last["pending_invoices"] == 0
+        assert last["oldest_pending_date"] is None
+
+        response = await client.get("/schools/debt?sort=total_debt&size=2&page=1")
+        assert [s["ref"] for s in response.json()["items"]] == ["SCH003", "SCH002"]
+
+    @pytest.mark.asyncio
+    async def test_list_schools_debt_unknown_sort(self, client: AsyncClient):
+        response = await client.get("/schools/debt?sort=-students")
+        assert response.status_code == 400
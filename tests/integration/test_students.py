@@ -58,3 +58,74 @@ class TestIntegrationStudents:
     async def test_financial_status_student_not_found(self, client: AsyncClient):
         response = await client.get("/students/99999/financial-status")
         assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_students_cursor(self, client: AsyncClient, sample_students):
+        response = await client.get("/students/cursor?size=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert [s["email"] for s in data["items"]] == ["alice@test.com", "bob@test.com"]
+        assert data["next_cursor"] is not None
+
+        response = await client.get(
+            "/students/cursor", params={"size": 2, "after": data["next_cursor"]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [s["email"] for s in data["items"]] == ["charlie@test.com"]
+        assert data["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_financial_status_totals(
+        self, client: AsyncClient, sample_students, sample_payments
+    ):
+        student_id = sample_students[0].id
+        response = await client.get(f"/students/{student_id}/financial-status")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == student_id
+        assert float(data["total_paid"]) == 300.0
+        assert float(data["total_debt"]) == 500.0
+
+    @pytest.mark.asyncio
+    async def test_financial_status_without_invoices(
+        self, client: AsyncClient, sample_students
+    ):
+        student_id = sample_students[0].id
+        response = await client.get(f"/students/{student_id}/financial-status")
+        assert response.status_code == 200
+        data = response.json()
+        assert float(data["total_paid"]) == 0
+        assert float(data["total_debt"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_financial_status_batch(
+        self, client: AsyncClient, sample_students, sample_payments
+    ):
+        ids = [student.id for student in sample_students]
+        response = await client.post(
+            "/students/financial-status:batch",
+            params={"size": 2},
+            json={"ids": [ids[2], 99999, ids[0], ids[1], ids[0]]},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert [s["id"] for s in data["items"]] == sorted(ids)[:2]
+        first = next(s for s in data["items"] if s["id"] == ids[0])
+        assert float(first["total_paid"]) == 300.0
+        assert float(first["total_debt"]) == 500.0
+
+        response = await client.post(
+            "/students/financial-status:batch",
+            params={"size": 2, "page": 2},
+            json={"ids": ids},
+        )
+        assert [s["id"] for s in response.json()["items"]] == sorted(ids)[2:]
+
+    @pytest.mark.asyncio
+    async def test_financial_status_batch_too_many_ids(self, client: AsyncClient):
+        response = await client.post(
+            "/students/financial-status:batch", json={"ids": list(range(1001))}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,88 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, literal, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from infrastructure.database.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def checkouts(db_session):
+    engine = db_session.bind.sync_engine
+    counter = {"checkouts": 0}
+
+    def on_checkout(*args):
+        counter["checkouts"] += 1
+
+    event.listen(engine, "checkout", on_checkout)
+    yield counter
+    event.remove(engine, "checkout", on_checkout)
+
+
+@pytest.mark.asyncio
+class TestIntegrationUnitOfWork:
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/students/{student_id}/financial-status",
+            "/schools/{school_id}/debt",
+            "/schools/{school_id}/students",
+            "/invoices/?student_id={student_id}",
+            "/invoices/payments?student_id={student_id}&expand=student,school",
+        ],
+    )
+    async def test_one_checkout_per_read_request(
+        self, client: AsyncClient, checkouts, path, sample_students, sample_payments
+    ):
+        school_id = sample_payments[0].invoice.school_id
+        checkouts["checkouts"] = 0
+        response = await client.get(
+            path.format(student_id=sample_students[0].id, school_id=school_id)
+        )
+        assert response.status_code == 200
+        assert checkouts["checkouts"] == 1
+
+    async def test_one_checkout_per_write_request(
+        self, client: AsyncClient, checkouts, sample_invoices
+    ):
+        checkouts["checkouts"] = 0
+        response = await client.post(
+            "/invoices/payments",
+            json={
+                "ref": "PAY100",
+                "invoice_id": sample_invoices[0].id,
+                "value": "10.00",
+                "date": "2025-01-01T00:00:00",
+            },
+        )
+        assert response.status_code == 201
+        assert checkouts["checkouts"] == 1
+
+    async def test_read_only_requests_share_one_transaction(self, db_session):
+        engine = db_session.bind.sync_engine
+        transactions = []
+
+        def on_begin(conn):
+            transactions.append(conn)
+
+        event.listen(engine, "begin", on_begin)
+        try:
+            async with UnitOfWork(async_sessionmaker(db_session.bind)) as uow:
+                for _ in range(3):
+                    async with uow() as session:
+                        await session.execute(select(literal(1)))
+        finally:
+            event.remove(engine, "begin", on_begin)
+        assert len(transactions) == 1
+
+    async def test_error_rolls_back_and_closed_unit_is_not_reused(self, db_session):
+        uow = UnitOfWork(async_sessionmaker(db_session.bind))
+        with pytest.raises(ValueError):
+            async with uow() as session:
+                raise ValueError()
+        assert not session.in_transaction()
+
+        await uow.close()
+        with pytest.raises(RuntimeError):
+            async with uow():
+                pass
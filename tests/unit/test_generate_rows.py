@@ -0,0 +1,60 @@
+from collections import Counter
+
+from domain.models.student import Student
+from infrastructure.database.generate import COLUMNS, GenerateSpec, generate_rows
+
+
+def test_rows_are_deterministic():
+    spec = GenerateSpec(
+        schools=3, students_per_school=4, invoices_per_student=5, seed=7
+    )
+
+    assert list(generate_rows(spec)) == list(generate_rows(spec))
+    assert list(generate_rows(spec)) != list(
+        generate_rows(GenerateSpec(3, 4, 5, seed=8))
+    )
+
+
+def test_row_counts_and_references():
+    spec = GenerateSpec(schools=3, students_per_school=4, invoices_per_student=5)
+    rows = list(generate_rows(spec))
+    counts = Counter(name for name, _ in rows)
+
+    assert (counts["schools"], counts["students"], counts["invoices"]) == (3, 12, 60)
+    assert 12 <= counts["school_students"] <= 24
+
+    # every row comes after the rows it references
+    seen = {name: set() for name in counts}
+    for name, row in rows:
+        if name == "school_students":
+            assert row[1] in seen["schools"] and row[2] in seen["students"]
+        elif name == "invoices":
+            assert row[6] in seen["students"] and row[7] in seen["schools"]
+        elif name == "payments":
+            assert row[5] in seen["invoices"]
+        seen[name].add(row[0])
+
+
+def test_payment_ratio():
+    def paid(ratio: float) -> int:
+        spec = GenerateSpec(2, 10, 12, payment_ratio=ratio)
+        return sum(
+            1
+            for name, row in generate_rows(spec)
+            if name == "invoices" and row[4] == "PAID"
+        )
+
+    assert paid(0) == 0
+    assert paid(1) == 240
+    assert 100 < paid(0.5) < 140
+
+
+def test_students_are_valid_domain_models():
+    spec = GenerateSpec(schools=5, students_per_school=200, invoices_per_student=0)
+    students = [
+        Student(**dict(zip(COLUMNS["students"], row)))
+        for name, row in generate_rows(spec)
+        if name == "students"
+    ]
+
+    assert len(students) == 1000
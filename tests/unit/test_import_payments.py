@@ -0,0 +1,105 @@
+import pytest
+
+from domain.models.invoice import BulkRowError
+from infrastructure.database.import_payments import (
+    MAX_RECORD_LINES,
+    PaymentImportError,
+    iter_lines,
+    iter_rows,
+)
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_handles_split_chunks():
+    data = "﻿ref,invoice_ref\r\nPAGO-ñ,INV001\nlast".encode()
+    # split inside the BOM, the CRLF and the two byte "ñ"
+    chunks = [data[:2], data[2:20], data[20:28], data[28:]]
+    lines = await _collect(iter_lines(_chunks(*chunks)))
+    assert lines == ["ref,invoice_ref", "PAGO-ñ,INV001", "last"]
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_validates_each_record():
+
+    async def csv_lines():
+        for line in [
+            "date,value,invoice_ref,ref",
+            '2025-01-01,"1,000.50",INV001,PAY1',
+            "",
+            "2025-01-01,10,INV001,PAY2",
+            "2025-01-01,10",
+        ]:
+            yield line
+
+    rows = await _collect(iter_rows(csv_lines()))
+    assert isinstance(rows[0], BulkRowError) and rows[0].ref == "PAY1"
+    assert rows[1]["ref"] == "PAY2" and rows[1]["invoice_ref"] == "INV001"
+    assert isinstance(rows[2], BulkRowError) and rows[2].index == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_requires_header_columns():
+    async def csv_lines():
+        yield "ref,value"
+
+    with pytest.raises(PaymentImportError):
+        await _collect(iter_rows(csv_lines()))
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_reads_quoted_newlines():
+    data = (
+        b'ref,invoice_ref,value,date\n"PAY\n1",INV001,10,2025-01-01\n'
+        b'"PAY ""2""",INV001,"1\n\n0",2025-01-01\n'
+        b"PAY3,INV001,10,2025-01-01\n"
+    )
+    rows = await _collect(iter_rows(iter_lines(_chunks(data))))
+    assert rows[0]["ref"] == "PAY\n1"
+    assert isinstance(rows[1], BulkRowError) and rows[1].ref == 'PAY "2"'
+    assert rows[2]["ref"] == "PAY3"
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_keeps_reading_after_a_stray_quote():
+    data = (
+        b"ref,invoice_ref,value,date\n"
+        b"PAY1,INV1,10,2025-01-01\n"
+        b'PAY2,INV"2,10,2025-01-01\n'
+        b'PAY3,"INV3,10,2025-01-01\n'
+        b"PAY4,INV4,10,2025-01-01\n"
+        b"PAY5,INV5,10,2025-01-01\n"
+    )
+    rows = await _collect(iter_rows(iter_lines(_chunks(data))))
+    assert [row["invoice_ref"] for row in rows if isinstance(row, dict)] == [
+        "INV1",
+        'INV"2',
+        "INV4",
+        "INV5",
+    ]
+    assert isinstance(rows[2], BulkRowError) and rows[2].index == 2
+    assert rows[2].detail == "Unterminated quoted field"
+    assert len(rows) == 5
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_caps_the_lines_of_one_record():
+    lines = ["ref,invoice_ref,value,date", 'PAY1,"INV1,10,2025-01-01']
+    lines += [f"PAY{i},INV{i},10,2025-01-01" for i in range(2, 2 + MAX_RECORD_LINES)]
+
+    async def csv_lines():
+        for line in lines:
+            yield line
+
+    rows = await _collect(iter_rows(csv_lines()))
+    assert isinstance(rows[0], BulkRowError)
+    assert all(isinstance(row, dict) for row in rows[1:])
+    assert len(rows) == MAX_RECORD_LINES + 1
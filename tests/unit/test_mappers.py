@@ -0,0 +1,56 @@
+from datetime import datetime
+from decimal import Decimal
+
+from domain.models.invoice import InvoiceStatus
+from domain.models.school import School
+from domain.models.student import Student
+from infrastructure.database.orm import InvoiceTable, SchoolTable, StudentTable
+from infrastructure.repositories.mappers import to_invoice, to_school, to_student
+
+
+def make_invoice() -> InvoiceTable:
+    now = datetime(2025, 1, 1)
+    student = StudentTable(
+        id=1,
+        first_name="Alice",
+        last_name="Johnson",
+        email="alice@test.com",
+        age=16,
+        created_at=now,
+    )
+    school = SchoolTable(id=2, ref="SCH001", name="Lincoln", created_at=now)
+    return InvoiceTable(
+        id=3,
+        ref="INV001",
+        value=Decimal("500.00"),
+        date=now,
+        status=InvoiceStatus.PENDING,
+        created_at=now,
+        student_id=student.id,
+        school_id=school.id,
+        student=student,
+        school=school,
+    )
+
+
+class TestMappers:
+    def test_trusted_models_match_validated_models(self):
+        invoice = make_invoice()
+
+        student = to_student(invoice.student)
+        school = to_school(invoice.school)
+
+        assert student == Student.model_validate(student.model_dump())
+        assert school == School.model_validate(school.model_dump())
+
+    def test_invoice_is_slim_unless_expanded(self):
+        invoice = make_invoice()
+
+        slim = to_invoice(invoice)
+        expanded = to_invoice(invoice, ("student", "school"))
+
+        assert slim.student == 1
+        assert slim.school == 2
+        assert expanded.student.email == "alice@test.com"
+        assert expanded.school.ref == "SCH001"
+        assert '"student":1' in slim.model_dump_json()
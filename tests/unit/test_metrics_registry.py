@@ -0,0 +1,50 @@
+import pytest
+
+from infrastructure.metrics import Registry
+
+
+def test_render_counter_and_gauge():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ["route"])
+    in_progress = registry.gauge("in_progress", "In progress.")
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"quoted"')
+    in_progress.inc()
+    in_progress.dec()
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/a"} 1\n'
+        'requests_total{route="/b\\"quoted\\""} 2\n'
+        "# HELP in_progress In progress.\n"
+        "# TYPE in_progress gauge\n"
+        "in_progress 0\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    assert latency.count() == 4
+    assert latency.sum() == pytest.approx(3.65)
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_labels_must_match():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ["route"])
+    with pytest.raises(ValueError):
+        requests.inc(status="200")
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Again.")
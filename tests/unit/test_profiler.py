@@ -0,0 +1,77 @@
+import logging
+
+from infrastructure.profiler import (
+    ProfilerSettings,
+    RequestProfile,
+    StatementRecord,
+    log_profile,
+    server_timing,
+    statement_shape,
+)
+
+
+def test_statement_shape_replaces_literals_and_placeholders():
+    assert (
+        statement_shape("SELECT *\n  FROM students WHERE id = ? AND email = 'a@b.c'")
+        == "SELECT * FROM students WHERE id = ? AND email = ?"
+    )
+    assert (
+        statement_shape("SELECT anon_1.id FROM t LIMIT $1::INTEGER OFFSET 20")
+        == "SELECT anon_1.id FROM t LIMIT ? OFFSET ?"
+    )
+    assert statement_shape("SELECT ref FROM t WHERE id = %(id_1)s") == (
+        "SELECT ref FROM t WHERE id = ?"
+    )
+    assert statement_shape("SELECT CAST(x AS TEXT)::text") == (
+        "SELECT CAST(x AS TEXT)::text"
+    )
+
+
+def test_statement_shape_collapses_placeholder_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == (
+        statement_shape("SELECT * FROM t WHERE id IN (?)")
+    )
+    assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (?)"
+    )
+
+
+def test_repeated_shapes_over_threshold():
+    profile = RequestProfile(
+        statements=[
+            StatementRecord(f"SELECT * FROM invoices WHERE student_id = {i}", 0.001)
+            for i in range(4)
+        ]
+        + [StatementRecord("SELECT * FROM students", 0.002)]
+    )
+
+    assert profile.repeated_shapes(3) == [
+        ("SELECT * FROM invoices WHERE student_id = ?", 4)
+    ]
+    assert profile.repeated_shapes(4) == []
+    assert [record.seconds for record in profile.slowest(2)] == [0.002, 0.001]
+
+
+def test_server_timing():
+    profile = RequestProfile(statements=[StatementRecord("SELECT 1", 0.0015)])
+    assert server_timing(profile) == 'db;dur=1.500, db-queries;desc="1"'
+
+    profile.endpoint_finished = 10.0
+    assert server_timing(profile, now=10.0025).endswith("serialize;dur=2.500")
+
+
+def test_log_profile_warns_on_repeated_shape(caplog):
+    caplog.set_level(logging.INFO, logger="infrastructure.profiler")
+    profile = RequestProfile(
+        statements=[
+            StatementRecord("SELECT * FROM schools WHERE id = ?", 0.001)
+            for _ in range(3)
+        ]
+    )
+
+    log_profile(profile, "GET /schools/", ProfilerSettings(n_plus_one_threshold=2))
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings == [
+        "GET /schools/: possible N+1, statement ran 3 times: SELECT * FROM schools WHERE id = ?"
+    ]
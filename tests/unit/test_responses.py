@@ -0,0 +1,123 @@
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi_pagination import Page, Params
+
+from domain.models.invoice import Invoice, InvoiceStatus, Payment
+from domain.models.school import School, SchoolDebt
+from domain.models.student import Student
+from infrastructure.profiler import mark_endpoint_finished, profile_request
+from responses import (
+    FastJSONResponse,
+    cache_control,
+    dumps_orjson,
+    dumps_pydantic,
+    etag,
+    get_encoder,
+)
+
+
+def make_payment() -> Payment:
+    now = datetime(2025, 1, 1, 8, 30, 0, 125)
+    student = Student(
+        id=1,
+        first_name="Alice",
+        last_name="Johnson",
+        email="alice@test.com",
+        age=16,
+        created_at=now,
+        total_debt=Decimal("0.10"),
+    )
+    school = School(id=2, ref="SCH001", name="Lincoln", created_at=now)
+    invoice = Invoice(
+        id=3,
+        ref="INV001",
+        value=Decimal("450.00"),
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        status=InvoiceStatus.PAID,
+        created_at=now,
+        student=student,
+        school=school,
+    )
+    return Payment(
+        id=4,
+        ref="PAY001",
+        invoice=invoice,
+        value=Decimal("450.00"),
+        date=now,
+        created_at=now,
+    )
+
+
+class TestEncoders:
+    def test_orjson_matches_pydantic(self):
+        payment = make_payment()
+        slim = payment.invoice.model_copy(update={"student": 1, "school": 2})
+        debt = SchoolDebt(
+            id=2,
+            ref="SCH001",
+            name="Lincoln",
+            total_debt=Decimal("900.00"),
+            pending_invoices=2,
+        )
+        params = Params(page=1, size=50)
+
+        for page in (
+            Page.create(items=[payment], params=params, total=1),
+            Page.create(items=[slim, payment.invoice], params=params, total=2),
+            Page.create(items=[debt], params=params, total=1),
+        ):
+            assert dumps_orjson(page) == dumps_pydantic(page)
+
+    def test_decimal_status_and_dates(self):
+        body = dumps_orjson(make_payment().invoice)
+
+        assert b'"value":"450.00"' in body
+        assert b'"status":"PAID"' in body
+        assert b'"date":"2025-01-01T00:00:00Z"' in body
+        assert b'"total_debt":"0.10"' in body
+
+    def test_unknown_encoder(self):
+        with pytest.raises(ValueError, match="JSON_RESPONSE_ENCODER"):
+            get_encoder("ujson")
+
+    def test_response_renders_with_encoder(self):
+        invoice = make_payment().invoice
+        response = FastJSONResponse(invoice)
+
+        assert response.body == FastJSONResponse.encoder(invoice)
+        assert response.headers["content-type"] == "application/json"
+
+    def test_render_counts_as_serialization(self):
+        encoded = []
+
+        class RecordingResponse(FastJSONResponse):
+            encoder = staticmethod(
+                lambda content: encoded.append(time.perf_counter()) or b"{}"
+            )
+
+        with profile_request() as profile:
+            RecordingResponse({})
+            finished = profile.endpoint_finished
+            # ProfiledRoute marks the endpoint again when it returns
+            mark_endpoint_finished()
+
+        assert finished is not None and finished <= encoded[0]
+        assert profile.endpoint_finished == finished
+
+
+class TestConditionalGet:
+    def test_etag_is_strong_and_stable(self):
+        tag = etag("student", 1, datetime(2025, 1, 1))
+
+        assert tag == etag("student", 1, datetime(2025, 1, 1))
+        assert tag != etag("student", 2, datetime(2025, 1, 1))
+        assert tag.startswith('"') and not tag.startswith("W/")
+
+    def test_cache_control_per_route(self, monkeypatch):
+        monkeypatch.setenv("CACHE_CONTROL_SCHOOL", "public, max-age=60")
+
+        assert cache_control("school") == "public, max-age=60"
+        assert cache_control("student") == "private, no-cache"
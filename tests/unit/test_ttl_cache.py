@@ -0,0 +1,92 @@
+from datetime import datetime
+
+from domain.models.school import School
+from infrastructure.repositories.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_school(school_id: int) -> School:
+    return School(
+        id=school_id, ref=f"SCH{school_id}", name="School", created_at=datetime.now()
+    )
+
+
+def test_get_returns_a_copy():
+    cache = TTLCache(max_entries=10, ttls={"school": 60})
+    cache.set("school", 1, make_school(1))
+
+    cached = cache.get("school", 1)
+    cached.name = "Changed"
+    assert cache.get("school", 1).name == "School"
+    assert (cache.stats.hits, cache.stats.misses) == (2, 0)
+
+
+def test_entries_expire_after_their_namespace_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttls={"school": 60, "school_debt": 5}, clock=clock)
+    cache.set("school", 1, make_school(1))
+    cache.set("school_debt", 1, make_school(1))
+
+    clock.now = 10
+    assert cache.get("school_debt", 1) is None
+    assert cache.get("school", 1) is not None
+    assert cache.stats.expirations == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2, ttls={"school": 60})
+    cache.set("school", 1, make_school(1))
+    cache.set("school", 2, make_school(2))
+    cache.get("school", 1)
+    cache.set("school", 3, make_school(3))
+
+    assert cache.get("school", 2) is None
+    assert cache.get("school", 1) is not None
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_zero_ttl_disables_the_namespace():
+    cache = TTLCache(max_entries=10, ttls={"school": 0})
+    cache.set("school", 1, make_school(1))
+    assert len(cache) == 0
+
+
+def test_invalidate():
+    cache = TTLCache(max_entries=10, ttls={"school": 60})
+    cache.set("school", 1, make_school(1))
+    cache.invalidate("school", 1, 2)
+
+    assert cache.get("school", 1) is None
+    assert cache.stats.invalidations == 1
+
+
+def test_set_after_concurrent_invalidate_is_dropped():
+    cache = TTLCache(max_entries=10, ttls={"school": 60})
+    # a read queries the database, then a write commits and invalidates
+    generation = cache.generation()
+    cache.invalidate("school", 1)
+    cache.set("school", 1, make_school(1), generation)
+    cache.set("school", 2, make_school(2), generation)
+
+    assert cache.get("school", 1) is None
+    assert cache.get("school", 2) is not None
+
+    cache.set("school", 1, make_school(1), cache.generation())
+    assert cache.get("school", 1) is not None
+
+
+def test_reads_older_than_the_kept_invalidations_are_not_cached():
+    cache = TTLCache(max_entries=2, ttls={"school": 60})
+    generation = cache.generation()
+    cache.invalidate("school", 1, 2, 3)
+
+    cache.set("school", 4, make_school(4), generation)
+    assert cache.get("school", 4) is None